@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import hmac
+import os
 import sys
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
-from fastapi import Body, FastAPI, HTTPException
+from fastapi import Body, FastAPI, Header, HTTPException, Query
+from fastapi.encoders import jsonable_encoder
 from fastapi.middleware.cors import CORSMiddleware
 
 # Ensure backend/src is on the import path for zestie_matcher
@@ -13,11 +16,17 @@ SRC_PATH = BACKEND_ROOT / "src"
 if str(SRC_PATH) not in sys.path:
     sys.path.append(str(SRC_PATH))
 
-from zestie_matcher.matcher.match import Preference, load_normalized_feed, rank_dogs
+from zestie_matcher.matcher.match import Preference, decode_page_token, encode_page_token
+from zestie_matcher.matcher.projection import project_detail, project_fields
 
-from .models import DogResponse, FilterRequest, RecommendationResponse, ResponseMeta
-from .services.view_manager import view_manager
+from .models import FilterRequest, RecommendationResponse, ResponseMeta
+from .responses import FragmentResponse, encode_fragment, encode_result
+from .services.event_queue import EventQueueFull, event_queue
+from .services.feed_manager import feed_manager
+from .services.ranking import RankingSaturated, RankRequest, ranking_executor
+from .services.view_manager import is_loggable_id, view_manager
 from .services.analytics_manager import analytics_manager
+from .services.recommend_cache import recommend_cache
 
 
 app = FastAPI()
@@ -29,18 +38,41 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-DOGS_DATA: List[dict] = []
+# Optional shared secret for admin endpoints (sent as X-Admin-Token).
+ADMIN_TOKEN = os.environ.get("ZESTIE_ADMIN_TOKEN")
+
+
+# Seconds clients are asked to wait when a request is shed with a 503.
+RETRY_AFTER_SECONDS = "1"
 
 
 @app.on_event("startup")
-def startup_event() -> None:
-    global DOGS_DATA
+async def startup_event() -> None:
     try:
-        DOGS_DATA = load_normalized_feed()
+        feed_manager.load()
     except Exception as exc:  # pragma: no cover - fatal startup
         raise RuntimeError("Failed to load dogs data") from exc
+    # Start ranking workers (process mode) once the feed they will load is known.
+    ranking_executor.start(feed_manager)
+    feed_manager.start()
     view_manager.load()
+    view_manager.start()
     analytics_manager.load()
+    analytics_manager.start()
+    event_queue.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event() -> None:
+    await event_queue.close()
+    feed_manager.close()
+    ranking_executor.close()
+    analytics_manager.close()
+    view_manager.close()
+
+
+def overloaded(detail: str) -> HTTPException:
+    return HTTPException(status_code=503, detail=detail, headers={"Retry-After": RETRY_AFTER_SECONDS})
 
 
 def to_preferences(items: List) -> List[Preference]:
@@ -59,67 +91,131 @@ def to_preferences(items: List) -> List[Preference]:
 
 
 @app.post("/api/recommend", response_model=RecommendationResponse)
-def recommend(payload: FilterRequest = Body(...)) -> RecommendationResponse:
-    if not DOGS_DATA:
+async def recommend(payload: FilterRequest = Body(...)) -> FragmentResponse:
+    # One generation per request, so a concurrent reload cannot mix feeds.
+    feed = feed_manager.current
+    if not feed.dogs:
         raise HTTPException(status_code=503, detail="Dogs data not loaded")
-    analytics_manager.increment("recommend_calls")
-    prefs = to_preferences(payload.preferences)
-    for field, value in payload.hard_filters.items():
-        if value not in (None, ""):
-            analytics_manager.track_filter(field, str(value))
-    ranked = rank_dogs(
-        DOGS_DATA,
-        prefs,
+    try:
+        exclude_ids = decode_page_token(payload.cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    exclude_ids.update(payload.seen_dog_ids)
+    request = RankRequest(
+        cache_key=recommend_cache.make_key(payload.hard_filters, jsonable_encoder(payload.preferences)),
+        preferences=to_preferences(payload.preferences),
         desired=payload.hard_filters,
-        views=view_manager.get_views(),
-        top_n=14,
-        source_cap=6,
-        exploration_slots=6,
+        views=view_manager.snapshot(),
+        exclude_ids=exclude_ids,
     )
-    filtered = [item for item in ranked if item["dog"]["id"] not in payload.seen_dog_ids]
-    final = filtered[:14]
+    try:
+        # Scoring is CPU-bound; it runs in the bounded ranking executor, never on the loop.
+        ranked = await ranking_executor.run(feed, request)
+    except RankingSaturated:
+        raise overloaded("Ranking is at capacity, retry shortly") from None
+    # Counters are best-effort: a saturated write queue drops them rather than failing the request.
+    event_queue.post_or_drop(analytics_manager.increment, "recommend_calls")
+    for field, value in payload.hard_filters.items():
+        if value not in (None, ""):
+            event_queue.post_or_drop(analytics_manager.track_filter, field, str(value))
 
-    dog_responses: List[DogResponse] = []
-    for item in final:
+    cards = feed.cards
+    results: List[bytes] = []
+    for item in ranked:
         dog = item["dog"]
-        dog_responses.append(
-            DogResponse(
+        if payload.fields:
+            dog_data = encode_fragment(project_fields(dog, payload.fields))
+        else:
+            dog_data = cards[item["position"]]
+        results.append(
+            encode_result(
                 dog_id=dog["id"],
-                name=dog.get("name"),
+                # DogResponse.name is a str; validation is bypassed here, so coalesce.
+                name=dog.get("name") or "",
                 section=item.get("section", "best"),
                 score=float(item.get("final_score", item.get("core_score", 0.0))),
                 completeness=float(item.get("completeness", 0.0)),
                 reasons=item.get("reasons", []),
-                dog_data=dog,
+                dog_data=dog_data,
             )
         )
 
     prompt_trigger = None
-    if len(dog_responses) < 5 and any(not pref.allow_unknown for pref in payload.preferences):
+    if len(results) < 5 and any(not pref.allow_unknown for pref in payload.preferences):
         prompt_trigger = "low_results"
-    explore_count = sum(1 for r in dog_responses if r.section == "explore")
+    explore_count = sum(1 for item in ranked if item.get("section") == "explore")
     if explore_count:
-        analytics_manager.increment("explore_slots_served", explore_count)
-
-    return RecommendationResponse(
-        results=dog_responses,
-        meta=ResponseMeta(total_found=len(dog_responses), prompt_trigger=prompt_trigger),
+        event_queue.post_or_drop(analytics_manager.increment, "explore_slots_served", explore_count)
+
+    # Only ids of this feed go into the cursor: client-sent seen ids and ids dropped by
+    # a reload would otherwise pile up in it on every page.
+    positions = feed.index.positions
+    served = {dog_id for dog_id in exclude_ids if dog_id in positions}
+    served.update(item["dog"]["id"] for item in ranked)
+    meta = ResponseMeta(
+        total_found=len(results),
+        prompt_trigger=prompt_trigger,
+        next_cursor=encode_page_token(served),
     )
+    # Cards are pre-encoded trusted data, so skip RecommendationResponse validation.
+    return FragmentResponse(results, jsonable_encoder(meta))
+
 
+@app.get("/api/dog/{dog_id}")
+def dog_detail(dog_id: str, include_raw: bool = Query(False)):
+    feed = feed_manager.current
+    position = feed.index.positions.get(dog_id)
+    if position is None:
+        raise HTTPException(status_code=404, detail="Dog not found")
+    dog = feed.index.dogs[position]
+    detail = project_detail(dog)
+    if include_raw:
+        # Raw payloads live in a sidecar store and are read only for this request.
+        detail["raw"] = feed.raw_payload(dog)
+    return detail
 
-@app.post("/api/view/{dog_id}")
-def view_increment(dog_id: str):
+
+def record_view(dog_id: str) -> None:
     analytics_manager.increment("dog_views")
-    count = view_manager.increment(dog_id)
-    return {"status": "ok", "dog_id": dog_id, "new_count": count}
+    view_manager.increment(dog_id)
+
+
+@app.post("/api/view/{dog_id}", status_code=202)
+async def view_increment(dog_id: str):
+    if not is_loggable_id(dog_id):
+        raise HTTPException(status_code=400, detail="Invalid dog id")
+    # Applied asynchronously; the view counts once the event queue drains.
+    try:
+        event_queue.post(record_view, dog_id)
+    except EventQueueFull:
+        raise overloaded("Too many pending writes, retry shortly") from None
+    # The write is still queued: report the count it will bring this dog to, as
+    # far as this process has applied so far (views still queued are not included).
+    return {"status": "accepted", "dog_id": dog_id, "new_count": view_manager.snapshot().get(dog_id, 0) + 1}
 
 
 @app.post("/api/session/start")
-def start_session():
-    analytics_manager.increment("total_sessions")
+async def start_session():
+    event_queue.post_or_drop(analytics_manager.increment, "total_sessions")
     return {"status": "ok"}
 
 
 @app.get("/api/stats")
 def get_stats():
-    return analytics_manager.get_stats()
+    stats = analytics_manager.get_stats()
+    stats["recommend_cache"] = ranking_executor.cache_stats()
+    stats["feed"] = feed_manager.stats()
+    stats["ranking"] = ranking_executor.stats()
+    stats["events"] = event_queue.stats()
+    return stats
+
+
+@app.post("/api/admin/reload-feed", status_code=202)
+def reload_feed(x_admin_token: Optional[str] = Header(None)):
+    # Admin endpoints are off unless a token is configured.
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token.encode("utf-8"), ADMIN_TOKEN.encode("utf-8")):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+    started = feed_manager.request_reload()
+    return {"status": "reloading" if started else "already_reloading", "generation": feed_manager.current.number}
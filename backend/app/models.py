@@ -17,6 +17,10 @@ class FilterRequest(BaseModel):
     hard_filters: Dict[str, Any] = Field(default_factory=dict)
     preferences: List[PreferenceItem] = Field(default_factory=list)
     seen_dog_ids: List[str] = Field(default_factory=list)
+    # Token from a previous response's meta.next_cursor; its ids are excluded like seen_dog_ids.
+    cursor: Optional[str] = None
+    # Normalized fields to return in dog_data instead of the default card projection.
+    fields: Optional[List[str]] = None
 
 
 class DogResponse(BaseModel):
@@ -32,6 +36,7 @@ class DogResponse(BaseModel):
 class ResponseMeta(BaseModel):
     total_found: int
     prompt_trigger: Optional[str] = None
+    next_cursor: Optional[str] = None
 
 
 class RecommendationResponse(BaseModel):
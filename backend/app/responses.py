@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, Iterable, List
+
+from fastapi.responses import Response
+
+
+def encode_fragment(value: Any) -> bytes:
+    # Same encoder settings as Starlette's JSONResponse.
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def encode_result(
+    dog_id: str,
+    name: str,
+    section: str,
+    score: float,
+    completeness: float,
+    reasons: List[Dict[str, Any]],
+    dog_data: bytes,
+) -> bytes:
+    """One DogResponse object, splicing an already-encoded ``dog_data`` fragment."""
+    head = encode_fragment(
+        {
+            "dog_id": dog_id,
+            "name": name,
+            "section": section,
+            "score": score,
+            "completeness": completeness,
+            "reasons": reasons,
+        }
+    )
+    return head[:-1] + b',"dog_data":' + dog_data + b"}"
+
+
+class FragmentResponse(Response):
+    """RecommendationResponse assembled from pre-encoded result fragments.
+
+    Bypasses model validation/serialization; only use it with trusted internal data.
+    """
+
+    media_type = "application/json"
+
+    def __init__(self, results: Iterable[bytes], meta: Dict[str, Any]) -> None:
+        body = b'{"results":[' + b",".join(results) + b'],"meta":' + encode_fragment(meta) + b"}"
+        super().__init__(content=body)
@@ -1,20 +1,90 @@
 from __future__ import annotations
 
 import json
+import os
+import sqlite3
 from datetime import datetime, timedelta
 from pathlib import Path
-from threading import Lock
-from typing import Dict, Any
+from threading import Event, Lock, Thread
+from typing import Dict, Any, Optional, Union
+
+from .sqlite_store import DAILY_PREFIX, FILTER_PREFIX, TOTALS_BUCKET, AnalyticsDeltas, SqliteAnalyticsStore
 
 BASE_DIR = Path(__file__).resolve().parents[2]
 DEFAULT_ANALYTICS_PATH = BASE_DIR / "data" / "analytics" / "usage.json"
+# Write-behind bounds: a crash loses at most this many seconds or updates.
+DEFAULT_FLUSH_INTERVAL = 5.0
+DEFAULT_FLUSH_EVERY = 500
 
 
-class AnalyticsManager:
+class JsonAnalyticsStore:
+    """Whole-document usage.json, private to one process."""
+
+    shared = False
+
     def __init__(self, path: Path | None = None) -> None:
         self._path = path or DEFAULT_ANALYTICS_PATH
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        try:
+            if self._path.exists():
+                return json.loads(self._path.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError):
+            pass
+        return None
+
+    def capture(self, data: Dict[str, Any]) -> str:
+        # Serialized under the manager lock; the file write happens outside it.
+        return json.dumps(data, indent=2)
+
+    def write(self, document: str, deltas: AnalyticsDeltas) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self._path.with_suffix(self._path.suffix + ".tmp")
+        temp_path.write_text(document, encoding="utf-8")
+        temp_path.replace(self._path)
+
+    def close(self) -> None:
+        return None
+
+
+AnalyticsStore = Union[JsonAnalyticsStore, SqliteAnalyticsStore]
+
+
+def make_analytics_store(kind: str) -> AnalyticsStore:
+    if kind == "json":
+        return JsonAnalyticsStore()
+    if kind == "sqlite":
+        return SqliteAnalyticsStore()
+    raise ValueError(f"Unknown analytics storage: {kind}")
+
+
+class AnalyticsManager:
+    """Usage counters kept in memory and flushed by a background thread.
+
+    Request paths only touch the in-memory document and a map of pending
+    deltas; ``start()`` launches the flusher and ``close()`` stops it with a
+    final flush. With a shared (SQLite) store, stats are read back from the
+    database so they include every worker.
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        flush_every: int = DEFAULT_FLUSH_EVERY,
+        store: Optional[AnalyticsStore] = None,
+    ) -> None:
+        self._store = store or JsonAnalyticsStore(path)
         self._data: Dict[str, Any] = {}
         self._lock = Lock()
+        self._save_lock = Lock()
+        self._flush_interval = flush_interval
+        self._flush_every = flush_every
+        self._pending = 0
+        self._deltas: AnalyticsDeltas = {}
+        self._wake = Event()
+        self._stopping = Event()
+        self._flusher: Optional[Thread] = None
 
     def _init_defaults(self) -> None:
         self._data = {
@@ -36,33 +106,86 @@ class AnalyticsManager:
         self._data["daily"] = {date: stats for date, stats in daily.items() if date >= cutoff}
 
     def load(self) -> None:
-        try:
-            if self._path.exists():
-                text = self._path.read_text(encoding="utf-8")
-                self._data = json.loads(text)
-            else:
-                self._init_defaults()
-        except (json.JSONDecodeError, OSError):
+        data = self._store.load()
+        with self._lock:
             self._init_defaults()
-        self._prune_old_daily()
+            if data is not None:
+                self._data.update(data)
+            self._prune_old_daily()
 
     def save(self) -> None:
-        self._path.parent.mkdir(parents=True, exist_ok=True)
-        temp_path = self._path.with_suffix(self._path.suffix + ".tmp")
-        temp_path.write_text(json.dumps(self._data, indent=2), encoding="utf-8")
-        temp_path.replace(self._path)
+        """Write the current counters now, regardless of pending updates."""
+        self._write(force=True)
+
+    def flush(self) -> None:
+        """Write only if anything changed since the last write."""
+        self._write(force=False)
+
+    def _write(self, force: bool) -> None:
+        with self._save_lock:
+            with self._lock:
+                if not self._pending and not force:
+                    return
+                document = self._store.capture(self._data)
+                deltas, self._deltas = self._deltas, {}
+                self._pending = 0
+            try:
+                self._store.write(document, deltas)
+            except (OSError, sqlite3.Error):
+                self._restore_deltas(deltas)
+                raise
+
+    def _restore_deltas(self, deltas: AnalyticsDeltas) -> None:
+        with self._lock:
+            for key, amount in deltas.items():
+                self._deltas[key] = self._deltas.get(key, 0) + amount
+            self._pending += len(deltas)
+
+    def start(self) -> None:
+        if self._flusher is not None:
+            return
+        self._stopping.clear()
+        self._flusher = Thread(target=self._run, name="analytics-flusher", daemon=True)
+        self._flusher.start()
+
+    def close(self) -> None:
+        if self._flusher is not None:
+            self._stopping.set()
+            self._wake.set()
+            self._flusher.join()
+            self._flusher = None
+        self.flush()
+        self._store.close()
+
+    def _run(self) -> None:
+        while not self._stopping.is_set():
+            self._wake.wait(self._flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except (OSError, sqlite3.Error):
+                # Keep the counters in memory and retry on the next tick.
+                continue
+
+    def _mark_dirty(self, bucket: str, key: str, amount: int) -> None:
+        # Caller holds self._lock.
+        self._deltas[(bucket, key)] = self._deltas.get((bucket, key), 0) + amount
+        self._pending += 1
+        if self._pending >= self._flush_every:
+            self._wake.set()
 
     def _increment_daily(self, key: str, amount: int) -> None:
         today = datetime.utcnow().strftime("%Y-%m-%d")
         daily = self._data.setdefault("daily", {})
         day_bucket = daily.setdefault(today, {})
         day_bucket[key] = day_bucket.get(key, 0) + amount
+        self._mark_dirty(DAILY_PREFIX + today, key, amount)
 
     def increment(self, key: str, amount: int = 1) -> None:
         with self._lock:
             self._data[key] = self._data.get(key, 0) + amount
+            self._mark_dirty(TOTALS_BUCKET, key, amount)
             self._increment_daily(key, amount)
-            self.save()
 
     def track_filter(self, field: str, value: str) -> None:
         if not value:
@@ -71,15 +194,21 @@ class AnalyticsManager:
             filters = self._data.setdefault("popular_filters", {})
             field_bucket = filters.setdefault(field, {})
             field_bucket[value] = field_bucket.get(value, 0) + 1
-            self.save()
+            self._mark_dirty(FILTER_PREFIX + field, value, 1)
 
     def record_prompt(self, accepted: bool) -> None:
         key = "prompt_accepts" if accepted else "prompt_declines"
         self.increment(key)
 
     def get_stats(self) -> Dict[str, Any]:
+        if self._store.shared:
+            self.flush()
+            with self._lock:
+                self._init_defaults()
+                self._data.update(self._store.read())
         with self._lock:
             return json.loads(json.dumps(self._data))
 
 
-analytics_manager = AnalyticsManager()
+# "json" (default) keeps usage.json per process; "sqlite" shares counters across workers.
+analytics_manager = AnalyticsManager(store=make_analytics_store(os.environ.get("ZESTIE_ANALYTICS_STORAGE", "json")))
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_MAX_SIZE = 10000
+# Events applied per hop to the worker thread; bounds how long one batch holds the managers' locks.
+DEFAULT_BATCH_SIZE = 256
+
+Event = Tuple[Callable[..., Any], Tuple[Any, ...]]
+
+
+class EventQueueFull(Exception):
+    """Raised by ``post`` when the queue is saturated."""
+
+
+class EventQueue:
+    """Fire-and-forget writes (analytics counters, view increments) applied off the event loop.
+
+    Handlers ``post`` a call and return immediately; a single consumer task
+    drains the queue in batches and runs each batch in a worker thread, so the
+    managers' locks and any file I/O never block the loop.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        self._max_size = max_size
+        self._batch_size = batch_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._consumer: Optional[asyncio.Task] = None
+        self._dropped = 0
+        self._failed = 0
+
+    def start(self) -> None:
+        """Create the queue and consumer on the running event loop."""
+        if self._consumer is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self._max_size)
+        self._consumer = asyncio.get_running_loop().create_task(self._consume())
+
+    async def close(self) -> None:
+        """Apply everything already queued, then stop the consumer."""
+        if self._consumer is None or self._queue is None:
+            return
+        await self._queue.join()
+        self._consumer.cancel()
+        try:
+            await self._consumer
+        except asyncio.CancelledError:
+            pass
+        self._consumer = None
+
+    def post(self, fn: Callable[..., Any], *args: Any) -> None:
+        if self._queue is None:
+            # Not started (e.g. called outside the app lifecycle): apply inline.
+            fn(*args)
+            return
+        try:
+            self._queue.put_nowait((fn, args))
+        except asyncio.QueueFull:
+            self._dropped += 1
+            raise EventQueueFull() from None
+
+    def post_or_drop(self, fn: Callable[..., Any], *args: Any) -> None:
+        """Best-effort variant for counters that must never fail a request."""
+        try:
+            self.post(fn, *args)
+        except EventQueueFull:
+            pass
+
+    async def _consume(self) -> None:
+        assert self._queue is not None
+        queue = self._queue
+        while True:
+            batch: List[Event] = [await queue.get()]
+            while len(batch) < self._batch_size and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                await asyncio.to_thread(self._apply, batch)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    def _apply(self, batch: List[Event]) -> None:
+        for fn, args in batch:
+            try:
+                fn(*args)
+            except Exception:  # one bad write must not stall the rest of the batch
+                self._failed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "max_size": self._max_size,
+            "dropped": self._dropped,
+            "failed": self._failed,
+        }
+
+
+event_queue = EventQueue(max_size=int(os.environ.get("ZESTIE_EVENT_QUEUE_SIZE", DEFAULT_MAX_SIZE)))
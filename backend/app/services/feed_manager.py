@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from zestie_matcher.matcher.binary_feed import BinaryFeed
+from zestie_matcher.matcher.match import DEFAULT_FEED_PATH, DogIndex, load_normalized_feed
+from zestie_matcher.matcher.projection import project_card
+from zestie_matcher.matcher.raw_store import RawStore
+
+from ..responses import encode_fragment
+from .recommend_cache import recommend_cache
+
+# How often the watcher stats the feed file for a new scrape.
+DEFAULT_POLL_INTERVAL = 5.0
+# "auto" memory-maps dogs.bin when the normalizer wrote one next to dogs.json (and it is at
+# least as new as the JSON), else parses the JSON.
+FEED_FORMATS = ("auto", "json", "binary")
+DEFAULT_FEED_FORMAT = "auto"
+
+# (inode, mtime_ns, size) of a feed file; any change triggers a rebuild.
+FileSignature = Tuple[int, int, int]
+# Signatures of every file the current format may load from (None when missing).
+FeedSignature = Tuple[Optional[FileSignature], ...]
+
+
+@dataclass(frozen=True)
+class FeedGeneration:
+    """Everything derived from one load of dogs.json, swapped as a unit."""
+
+    number: int
+    dogs: Sequence[Dict[str, Any]]
+    index: DogIndex
+    # Card projections aligned with index positions, JSON-encoded once per load.
+    cards: Sequence[bytes]
+    source: Optional[str]
+    signature: Optional[FeedSignature]
+    loaded_at: float
+    # Upstream payloads split out by the normalizer; None for feeds that still inline them.
+    raw: Optional[RawStore] = None
+    # Loaded from dogs.bin (memory-mapped) rather than parsed from dogs.json.
+    binary: bool = False
+
+    def raw_payload(self, dog: Dict[str, Any]) -> Optional[Any]:
+        if "raw" in dog:
+            return dog["raw"]
+        return self.raw.get(dog["id"]) if self.raw is not None else None
+
+
+EMPTY_GENERATION = FeedGeneration(0, [], DogIndex([]), [], None, None, 0.0)
+
+
+def _signature(path: Path) -> Optional[FileSignature]:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_mtime_ns, st.st_size
+
+
+class FeedManager:
+    """Holds the current feed generation and rebuilds it when dogs.json changes.
+
+    Requests read ``current`` once and use that generation throughout, so a swap
+    never changes the dogs under an in-flight request. Rebuilds run off the
+    request path (watcher thread or ``request_reload``) and only the final
+    reference assignment is visible to readers.
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        feed_format: str = DEFAULT_FEED_FORMAT,
+    ) -> None:
+        if feed_format not in FEED_FORMATS:
+            raise ValueError(f"Unknown feed format: {feed_format}")
+        self._json_path = path or DEFAULT_FEED_PATH
+        self._binary_path = self._json_path.with_suffix(".bin")
+        self._raw_path = self._json_path.with_suffix(".raw.bin")
+        self._format = feed_format
+        self._poll_interval = poll_interval
+        self._current = EMPTY_GENERATION
+        self._reload_lock = Lock()
+        self._reloader: Optional[Thread] = None
+        self._stopping = Event()
+        self._watcher: Optional[Thread] = None
+        self._last_error: Optional[str] = None
+        self._failed_signature: Optional[FeedSignature] = None
+        self._listeners: List[Callable[[FeedGeneration], None]] = []
+
+    @property
+    def current(self) -> FeedGeneration:
+        return self._current
+
+    @property
+    def json_path(self) -> Path:
+        return self._json_path
+
+    @property
+    def feed_format(self) -> str:
+        return self._format
+
+    def load(self) -> FeedGeneration:
+        """Build the first generation synchronously; errors propagate to the caller."""
+        with self._reload_lock:
+            self._swap(self._build())
+        return self._current
+
+    def reload(self, force: bool = False) -> bool:
+        """Rebuild if the feed changed (or ``force``); returns True when a new generation was swapped in.
+
+        A file that fails to load (unreadable, malformed, or with a record the
+        index rejects) leaves the current generation in place and is reported as
+        ``last_error``; the watcher retries once the file changes again.
+        """
+        with self._reload_lock:
+            signature = self._feed_signature()
+            if not force and signature in (self._current.signature, self._failed_signature):
+                return False
+            try:
+                generation = self._build()
+            except Exception as exc:
+                self._last_error = f"{type(exc).__name__}: {exc}"
+                self._failed_signature = signature
+                return False
+            self._swap(generation)
+            return True
+
+    def request_reload(self) -> bool:
+        """Start a forced rebuild in the background; False if one is already running."""
+        if self._reloader is not None and self._reloader.is_alive():
+            return False
+        self._reloader = Thread(target=self.reload, kwargs={"force": True}, name="feed-reload", daemon=True)
+        self._reloader.start()
+        return True
+
+    def _feed_signature(self) -> FeedSignature:
+        """Signatures of the files that decide what gets loaded: both of them in "auto" mode,
+        so a rewritten dogs.json is picked up even while a dogs.bin sits next to it."""
+        if self._format == "json":
+            return (_signature(self._json_path),)
+        if self._format == "binary":
+            return (_signature(self._binary_path),)
+        return _signature(self._json_path), _signature(self._binary_path)
+
+    def _source(self, signature: FeedSignature) -> Tuple[Path, bool]:
+        """The file to load and whether it is a binary feed."""
+        if self._format == "binary":
+            return self._binary_path, True
+        if self._format == "auto":
+            json_signature, binary_signature = signature
+            # A dogs.bin older than dogs.json is left over from an earlier run.
+            if binary_signature is not None and (json_signature is None or binary_signature[1] >= json_signature[1]):
+                return self._binary_path, True
+        return self._json_path, False
+
+    def _build(self) -> FeedGeneration:
+        before = self._feed_signature()
+        path, binary = self._source(before)
+        if binary:
+            # Sections stay in the shared mapping; dogs are decoded only when served.
+            feed = BinaryFeed(path)
+            dogs: Sequence[Dict[str, Any]] = feed.dogs
+            index = feed.index()
+            cards: Sequence[bytes] = feed.cards
+        else:
+            dogs = load_normalized_feed(path)
+            index = DogIndex(dogs)
+            cards = [encode_fragment(project_card(dog)) for dog in dogs]
+        if self._feed_signature() != before:
+            raise ValueError("feed changed while loading")
+        # The normalizer writes the raw store before the feed, so it is current here.
+        raw = RawStore(self._raw_path) if self._raw_path.exists() else None
+        return FeedGeneration(
+            number=self._current.number + 1,
+            dogs=dogs,
+            index=index,
+            cards=cards,
+            source=str(path),
+            signature=before,
+            loaded_at=time.time(),
+            raw=raw,
+            binary=binary,
+        )
+
+    def _swap(self, generation: FeedGeneration) -> None:
+        # Caller holds self._reload_lock.
+        self._current = generation
+        self._last_error = None
+        self._failed_signature = None
+        # Cache entries are keyed by generation already; clearing just frees them early.
+        recommend_cache.clear()
+        for listener in self._listeners:
+            # A failing listener must not undo the swap or stop the watcher.
+            try:
+                listener(generation)
+            except Exception as exc:
+                self._last_error = f"listener {getattr(listener, '__name__', listener)!s} failed: {type(exc).__name__}: {exc}"
+
+    def subscribe(self, listener: Callable[[FeedGeneration], None]) -> None:
+        """Call ``listener`` (on the reloading thread) after each new generation is swapped in."""
+        self._listeners.append(listener)
+
+    def start(self) -> None:
+        if self._watcher is not None or self._poll_interval <= 0:
+            return
+        self._stopping.clear()
+        self._watcher = Thread(target=self._run, name="feed-watcher", daemon=True)
+        self._watcher.start()
+
+    def _run(self) -> None:
+        while not self._stopping.wait(self._poll_interval):
+            try:
+                self.reload()
+            except Exception as exc:
+                # e.g. stat failing on a vanished directory; keep polling.
+                self._last_error = f"{type(exc).__name__}: {exc}"
+
+    def close(self) -> None:
+        if self._watcher is not None:
+            self._stopping.set()
+            self._watcher.join()
+            self._watcher = None
+        if self._reloader is not None:
+            self._reloader.join()
+            self._reloader = None
+
+    def stats(self) -> Dict[str, Any]:
+        generation = self._current
+        return {
+            "generation": generation.number,
+            "dogs": len(generation.dogs),
+            "source": generation.source,
+            "loaded_at": generation.loaded_at,
+            "reloading": self._reloader is not None and self._reloader.is_alive(),
+            "last_error": self._last_error,
+        }
+
+
+# Set ZESTIE_FEED_POLL_SECONDS=0 to disable the watcher and rely on the admin endpoint.
+feed_manager = FeedManager(
+    poll_interval=float(os.environ.get("ZESTIE_FEED_POLL_SECONDS", DEFAULT_POLL_INTERVAL)),
+    feed_format=os.environ.get("ZESTIE_FEED_FORMAT", DEFAULT_FEED_FORMAT),
+)
@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from zestie_matcher.matcher.match import (
+    Preference,
+    RankedSlot,
+    ViewSnapshot,
+    get_scorer,
+    materialize_slots,
+    select_ranked,
+    select_slots,
+)
+
+from .feed_manager import FeedGeneration, FeedManager
+from .ranking_pool import PoolClosed, RankingPool, WorkerFailed, pool_supported
+from .recommend_cache import RecommendCache, combine_stats, recommend_cache
+
+# "thread" scores in a bounded thread pool; "process" sends jobs to worker
+# processes that memory-map the same dogs.bin (see RankingPool), and scores in
+# threads while the feed is loaded from dogs.json.
+EXECUTOR_KINDS = ("thread", "process")
+DEFAULT_EXECUTOR_KIND = "thread"
+DEFAULT_WORKERS = 4
+# Jobs (running + queued) per worker before new requests are shed with a 503.
+DEFAULT_PENDING_PER_WORKER = 16
+
+TOP_N = 14
+SOURCE_CAP = 6
+EXPLORATION_SLOTS = 6
+
+
+class RankingSaturated(Exception):
+    """Raised instead of queueing when the ranking executor is at capacity."""
+
+
+@dataclass
+class RankRequest:
+    """Everything a ranking job needs besides the feed; picklable for process workers."""
+
+    cache_key: str
+    preferences: List[Preference]
+    desired: Dict[str, Any]
+    views: ViewSnapshot
+    exclude_ids: Set[str]
+
+
+def rank(feed: FeedGeneration, request: RankRequest) -> List[Dict[str, Any]]:
+    """Score (or reuse a cached scoring pass) and select one page from ``feed``."""
+    views_version = request.views.version
+    scored = recommend_cache.get(request.cache_key, feed.number, views_version)
+    if scored is None:
+        scored = get_scorer()(feed.index, request.preferences, request.desired, views=request.views)
+        recommend_cache.put(request.cache_key, scored, feed.number, views_version)
+    return select_ranked(
+        feed.index,
+        scored,
+        request.preferences,
+        desired=request.desired,
+        views=request.views,
+        top_n=TOP_N,
+        source_cap=SOURCE_CAP,
+        exploration_slots=EXPLORATION_SLOTS,
+        exclude_ids=request.exclude_ids,
+    )
+
+
+class _SlotHandler:
+    """Ranks in a pool worker against the feed generation the pool was started for.
+
+    Picklable: it carries the feed's path, format and signature, and the worker
+    memory-maps the binary feed itself. If the file changed in between
+    (positions would no longer line up with the API process's generation), the
+    failure is kept, jobs fail without reloading, and the caller ranks
+    in-process until the reload re-creates the pool.
+    """
+
+    def __init__(self, json_path: Path, feed_format: str, number: int, signature: Any) -> None:
+        self.json_path = json_path
+        self.feed_format = feed_format
+        self.number = number
+        self.signature = signature
+        self._feed: Optional[FeedGeneration] = None
+        self._error: Optional[str] = None
+        self._cache = RecommendCache()
+        self._views: Optional[ViewSnapshot] = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"json_path": self.json_path, "feed_format": self.feed_format, "number": self.number, "signature": self.signature}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)
+
+    def prepare(self) -> FeedGeneration:
+        if self._error is not None:
+            raise RuntimeError(self._error)
+        if self._feed is None:
+            try:
+                feed = FeedManager(self.json_path, poll_interval=0, feed_format=self.feed_format).load()
+            except Exception as exc:
+                self._error = f"loading the feed failed: {type(exc).__name__}: {exc}"
+                raise RuntimeError(self._error) from exc
+            if feed.signature != self.signature or not feed.binary:
+                self._error = f"feed changed since generation {self.number} was loaded"
+                raise RuntimeError(self._error)
+            self._feed = feed
+        return self._feed
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
+
+    def __call__(self, job: Tuple[RankRequest, Dict[str, int], int], views_base: Dict[str, int]) -> List[RankedSlot]:
+        feed = self.prepare()
+        request, recent, version = job
+        # One snapshot per base shares its aligned counts; requests only add their recent delta.
+        if self._views is None or self._views.base is not views_base:
+            self._views = ViewSnapshot(views_base)
+        views = self._views.with_recent(recent, version)
+        scored = self._cache.get(request.cache_key, self.number, version)
+        if scored is None:
+            scored = get_scorer()(feed.index, request.preferences, request.desired, views=views)
+            self._cache.put(request.cache_key, scored, self.number, version)
+        return select_slots(
+            feed.index,
+            scored,
+            desired=request.desired,
+            views=views,
+            top_n=TOP_N,
+            source_cap=SOURCE_CAP,
+            exploration_slots=EXPLORATION_SLOTS,
+            exclude_ids=request.exclude_ids,
+        )
+
+
+def _rank_in_pool(pool: RankingPool, feed: FeedGeneration, request: RankRequest) -> List[Dict[str, Any]]:
+    # Only the views delta travels with each job; a worker receives the base map once
+    # per base. Workers send back positions and scores only; dogs and reasons come from
+    # this process's feed.
+    views = request.views
+    job = (replace(request, views=None), dict(views.recent), views.version)
+    slots = pool.call(job, context=(views.base_id, views.base))
+    return materialize_slots(feed.index, slots, request.preferences, desired=request.desired)
+
+
+class RankingExecutor:
+    """Bounded executor for ranking jobs, awaited from async handlers.
+
+    At most ``max_pending`` jobs may be running or queued; beyond that ``run``
+    raises RankingSaturated so the caller can shed load instead of building an
+    unbounded backlog. In "process" mode a RankingPool of worker processes does
+    the scoring for the generation it was started for; it is re-created after
+    each feed reload, and requests for any other generation (or that a worker
+    fails) rank in-process. Workers only start for a generation loaded from
+    dogs.bin: with dogs.json each of them would parse its own copy of the feed.
+    """
+
+    def __init__(
+        self,
+        kind: str = DEFAULT_EXECUTOR_KIND,
+        workers: int = DEFAULT_WORKERS,
+        max_pending: Optional[int] = None,
+    ) -> None:
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Unknown ranking executor: {kind}")
+        if kind == "process" and not pool_supported():
+            kind = "thread"  # the pool starts workers from a fork server
+        self._kind = kind
+        self._workers = workers
+        self._max_pending = max_pending or workers * DEFAULT_PENDING_PER_WORKER
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._pool: Optional[RankingPool] = None
+        self._pool_lock = Lock()
+        self._feed_manager: Optional[FeedManager] = None
+        self._pending = 0
+        self._shed = 0
+        self._lock = Lock()
+
+    def start(self, feed_manager: FeedManager) -> None:
+        if self._threads is not None:
+            return
+        # In process mode these threads only wait on worker pipes.
+        self._threads = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="ranking")
+        if self._kind == "process":
+            self._feed_manager = feed_manager
+            self._start_pool(feed_manager.current)
+            feed_manager.subscribe(self._start_pool)
+
+    def _start_pool(self, feed: FeedGeneration) -> None:
+        # Runs on the feed-reload thread; workers come from the fork server, so no fork
+        # happens in this (threaded) process.
+        assert self._feed_manager is not None
+        pool: Optional[RankingPool] = None
+        if feed.binary:
+            handler = _SlotHandler(self._feed_manager.json_path, self._feed_manager.feed_format, feed.number, feed.signature)
+            pool = RankingPool(handler, self._workers, feed.number)
+        with self._pool_lock:
+            previous, self._pool = self._pool, pool
+        if previous is not None:
+            previous.close()
+
+    def close(self) -> None:
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.close()
+        if self._threads is not None:
+            self._threads.shutdown(wait=True, cancel_futures=True)
+            self._threads = None
+
+    async def run(self, feed: FeedGeneration, request: RankRequest) -> List[Dict[str, Any]]:
+        with self._lock:
+            if self._pending >= self._max_pending:
+                self._shed += 1
+                raise RankingSaturated()
+            self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            pool = self._pool
+            if pool is not None and pool.generation == feed.number:
+                try:
+                    return await loop.run_in_executor(self._threads, _rank_in_pool, pool, feed, request)
+                except (PoolClosed, WorkerFailed, EOFError, OSError):
+                    pass  # replaced, crashed or on a stale feed; rank in-process instead
+            return await loop.run_in_executor(self._threads, rank, feed, request)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Recommend cache stats summed over this process and the pool's workers."""
+        pool = self._pool
+        if pool is None:
+            return recommend_cache.stats()
+        return combine_stats([recommend_cache.stats(), *pool.worker_stats()])
+
+    def stats(self) -> Dict[str, Any]:
+        pool = self._pool
+        return {
+            "kind": self._kind,
+            "workers": self._workers,
+            # None in process mode while the feed comes from dogs.json (jobs run in threads).
+            "pool_generation": pool.generation if pool is not None else None,
+            "pending": self._pending,
+            "max_pending": self._max_pending,
+            "shed": self._shed,
+        }
+
+
+def _env_int(name: str) -> Optional[int]:
+    value = os.environ.get(name)
+    return int(value) if value else None
+
+
+ranking_executor = RankingExecutor(
+    kind=os.environ.get("ZESTIE_RANK_EXECUTOR", DEFAULT_EXECUTOR_KIND),
+    workers=_env_int("ZESTIE_RANK_WORKERS") or DEFAULT_WORKERS,
+    max_pending=_env_int("ZESTIE_RANK_MAX_PENDING"),
+)
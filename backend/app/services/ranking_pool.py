@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import multiprocessing
+import queue
+from multiprocessing.connection import Connection
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+# Called with (job, context); must be picklable, it is sent to every worker it starts.
+Handler = Callable[[Any, Any], Any]
+# (key, value): a large, rarely changing payload sent to a worker only when its key changes.
+Context = Tuple[Hashable, Any]
+
+
+class PoolClosed(Exception):
+    """Raised by ``call`` once the pool has been shut down (e.g. replaced after a feed reload)."""
+
+
+class WorkerFailed(RuntimeError):
+    """The handler raised in the worker; the message carries the worker-side error."""
+
+
+def pool_supported() -> bool:
+    return "forkserver" in multiprocessing.get_all_start_methods()
+
+
+def _serve(conn: Connection, handler: Handler) -> None:
+    # Child side: one (job, context key, context or None) in, one (ok, payload, stats)
+    # reply out, until the parent says stop. ``stats`` is the handler's ``stats()``, if any.
+    prepare = getattr(handler, "prepare", None)
+    stats = getattr(handler, "stats", None)
+    if prepare is not None:
+        try:
+            prepare()
+        except Exception:
+            pass  # the first job reports the error
+    context: Any = None
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            return
+        if message is None:
+            return
+        job, _, new_context = message
+        if new_context is not None:
+            context = new_context
+        try:
+            ok, payload = True, handler(job, context)
+        except Exception as exc:
+            ok, payload = False, f"{type(exc).__name__}: {exc}"
+        conn.send((ok, payload, stats() if stats is not None else None))
+
+
+class _Worker:
+    def __init__(self, context: Any, handler: Handler) -> None:
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=_serve, args=(child, handler), name="ranking-worker", daemon=True)
+        self.process.start()
+        child.close()
+        self.context_key: Optional[Hashable] = None
+        # The handler's stats as of this worker's last reply.
+        self.stats: Optional[Dict[str, Any]] = None
+
+    def call(self, job: Any, context: Optional[Context]) -> Any:
+        key, value = context if context is not None else (None, None)
+        if key == self.context_key:
+            value = None
+        self.conn.send((job, key, value))
+        self.context_key = key
+        ok, payload, self.stats = self.conn.recv()
+        if not ok:
+            raise WorkerFailed(payload)
+        return payload
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.conn.close()
+
+
+class RankingPool:
+    """Worker processes that run ``handler`` on jobs sent over per-worker pipes.
+
+    Workers are started from a fork server (a clean, single-threaded process),
+    never forked from the API process, whose background threads may hold locks
+    at fork time. ``handler`` is pickled to each worker, which loads its own
+    state (the feed: a memory-mapped ``dogs.bin`` is shared through the page
+    cache). Besides the job, ``call`` takes an optional context that a worker
+    receives only when its key differs from the last one it was sent. A handler
+    with a ``stats()`` method reports it with every reply (see ``worker_stats``).
+    Callers block in ``call`` until a worker is idle; starting and replacing
+    workers is safe from any thread.
+    """
+
+    def __init__(self, handler: Handler, workers: int, generation: int) -> None:
+        self.generation = generation
+        self._context = multiprocessing.get_context("forkserver")
+        self._handler = handler
+        self._size = workers
+        self._idle: "queue.Queue[Optional[_Worker]]" = queue.Queue()
+        self._workers: List[_Worker] = []
+        for _ in range(workers):
+            worker = _Worker(self._context, handler)
+            self._workers.append(worker)
+            self._idle.put(worker)
+
+    def call(self, job: Any, context: Optional[Context] = None) -> Any:
+        worker = self._idle.get()
+        if worker is None:
+            self._idle.put(None)  # let other waiters see the pool is closed too
+            raise PoolClosed()
+        try:
+            return worker.call(job, context)
+        except (EOFError, OSError):
+            # The process died mid-job: replace it and let the caller fall back.
+            worker.stop()
+            replacement = _Worker(self._context, self._handler)
+            self._workers[self._workers.index(worker)] = replacement
+            worker = replacement
+            raise
+        finally:
+            self._idle.put(worker)
+
+    def worker_stats(self) -> List[Dict[str, Any]]:
+        """The latest stats each worker reported (workers that have not replied yet are skipped)."""
+        return [worker.stats for worker in list(self._workers) if worker.stats is not None]
+
+    def close(self) -> None:
+        """Stop every worker, waiting for in-flight jobs to finish first."""
+        for _ in range(self._size):
+            self._idle.get().stop()
+        self._idle.put(None)
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Dict, Iterable, Optional
+
+from zestie_matcher.matcher.match import ScoredFeed
+
+DEFAULT_MAX_ENTRIES = 256
+# Each entry holds ~41 bytes per dog (five float64 score arrays plus keep), and every
+# process that ranks (the API and each ranking worker) has its own cache: bound the
+# total size too, or 256 entries of a 100k-dog feed would take about 1 GB per process.
+DEFAULT_MAX_BYTES = 64 << 20
+DEFAULT_TTL_SECONDS = 300.0
+# Scores embed the views-based exploration bonus; tolerate this many view
+# increments before a cached scoring pass is considered stale.
+DEFAULT_VIEWS_THRESHOLD = 200
+
+
+@dataclass
+class _Entry:
+    feed: ScoredFeed
+    nbytes: int
+    created_at: float
+    generation: int
+    views_version: int
+
+
+class RecommendCache:
+    """LRU/TTL cache of scored feeds keyed by the canonical filters + preferences.
+
+    Least recently used entries are evicted beyond ``max_entries`` or once the
+    score arrays exceed ``max_bytes``; a scored feed larger than the whole budget
+    is not cached. Per-user state (seen ids, cursors) is deliberately not part of the key:
+    callers apply exclusions on top of the cached scores at selection time.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        views_threshold: int = DEFAULT_VIEWS_THRESHOLD,
+    ) -> None:
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self._ttl = ttl_seconds
+        self._views_threshold = views_threshold
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def make_key(hard_filters: Dict[str, Any], preferences: Any) -> str:
+        # Preference order is kept: it fixes the float summation order of pref scores.
+        canonical = json.dumps(
+            {"hard_filters": hard_filters, "preferences": preferences},
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, generation: int, views_version: int) -> Optional[ScoredFeed]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._is_fresh(entry, generation, views_version):
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry.feed
+            if entry is not None:
+                del self._entries[key]
+                self._bytes -= entry.nbytes
+            self._misses += 1
+            return None
+
+    def put(self, key: str, feed: ScoredFeed, generation: int, views_version: int) -> None:
+        compact = feed.compact()
+        entry = _Entry(
+            feed=compact, nbytes=compact.nbytes, created_at=time.monotonic(), generation=generation, views_version=views_version
+        )
+        if entry.nbytes > self._max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            self._entries[key] = entry
+            self._bytes += entry.nbytes
+            while len(self._entries) > self._max_entries or self._bytes > self._max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self._evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def _is_fresh(self, entry: _Entry, generation: int, views_version: int) -> bool:
+        if entry.generation != generation:
+            return False
+        if time.monotonic() - entry.created_at > self._ttl:
+            return False
+        return views_version - entry.views_version <= self._views_threshold
+
+
+def combine_stats(stats: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Sum the ``stats()`` of several caches (e.g. one per ranking worker process)."""
+    totals = {"entries": 0, "bytes": 0, "hits": 0, "misses": 0, "evictions": 0}
+    for one in stats:
+        for name in totals:
+            totals[name] += one[name]
+    lookups = totals["hits"] + totals["misses"]
+    return {**totals, "hit_rate": round(totals["hits"] / lookups, 4) if lookups else 0.0}
+
+
+recommend_cache = RecommendCache()
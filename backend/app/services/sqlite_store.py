@@ -0,0 +1,281 @@
+"""SQLite persistence for view counts and analytics, shared by every API worker.
+
+The database runs in WAL mode so readers never block the single writer, each
+worker process opens its own connection, and counters are written as batched
+``count = count + delta`` upserts so concurrent workers never overwrite each
+other. Run this module to import the legacy JSON files explicitly:
+
+    cd backend && python -m app.services.sqlite_store
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sqlite3
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+BASE_DIR = Path(__file__).resolve().parents[2]
+DEFAULT_DB_PATH = BASE_DIR / "data" / "zestie.sqlite3"
+DEFAULT_VIEWS_JSON = BASE_DIR / "data" / "normalized" / "views.json"
+DEFAULT_ANALYTICS_JSON = BASE_DIR / "data" / "analytics" / "usage.json"
+# Buffered view increments per worker before a synchronous batch write.
+DEFAULT_VIEW_BATCH = 200
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS views (
+    dog_id TEXT PRIMARY KEY,
+    count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS analytics (
+    bucket TEXT NOT NULL,
+    key TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (bucket, key)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Analytics rows are (bucket, key, count): bucket "" holds the top-level totals,
+# "daily:<date>" and "filter:<field>" hold the nested usage.json maps.
+TOTALS_BUCKET = ""
+DAILY_PREFIX = "daily:"
+FILTER_PREFIX = "filter:"
+
+AnalyticsDeltas = Dict[Tuple[str, str], int]
+
+
+def connect(path: Path) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Autocommit mode; batches open explicit transactions.
+    conn = sqlite3.connect(str(path), timeout=30.0, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def migrate_from_json(
+    conn: sqlite3.Connection,
+    views_path: Path = DEFAULT_VIEWS_JSON,
+    analytics_path: Path = DEFAULT_ANALYTICS_JSON,
+) -> bool:
+    """Import the JSON files once; returns False if the database was already migrated."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if conn.execute("SELECT 1 FROM meta WHERE key = 'migrated_from_json'").fetchone():
+            conn.execute("ROLLBACK")
+            return False
+        views = _read_json(views_path)
+        if isinstance(views, dict):
+            conn.executemany(
+                "INSERT INTO views (dog_id, count) VALUES (?, ?) "
+                "ON CONFLICT(dog_id) DO UPDATE SET count = count + excluded.count",
+                [(str(k), int(v)) for k, v in views.items()],
+            )
+        usage = _read_json(analytics_path)
+        if isinstance(usage, dict):
+            _upsert_analytics(conn, document_to_deltas(usage))
+        conn.execute(
+            "INSERT INTO meta (key, value) VALUES ('migrated_from_json', ?)",
+            (datetime.utcnow().isoformat(timespec="seconds"),),
+        )
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    return True
+
+
+def _read_json(path: Path) -> Any:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def document_to_deltas(document: Dict[str, Any]) -> AnalyticsDeltas:
+    deltas: AnalyticsDeltas = {}
+    for key, value in document.items():
+        if key == "daily" and isinstance(value, dict):
+            for date, stats in value.items():
+                for stat, count in (stats or {}).items():
+                    deltas[(DAILY_PREFIX + date, stat)] = int(count)
+        elif key == "popular_filters" and isinstance(value, dict):
+            for field, values in value.items():
+                for filter_value, count in (values or {}).items():
+                    deltas[(FILTER_PREFIX + field, filter_value)] = int(count)
+        elif isinstance(value, (int, float)):
+            deltas[(TOTALS_BUCKET, key)] = int(value)
+    return deltas
+
+
+def rows_to_document(rows: Iterable[Tuple[str, str, int]]) -> Dict[str, Any]:
+    document: Dict[str, Any] = {"popular_filters": {}, "daily": {}}
+    for bucket, key, count in rows:
+        if bucket == TOTALS_BUCKET:
+            document[key] = count
+        elif bucket.startswith(DAILY_PREFIX):
+            document["daily"].setdefault(bucket[len(DAILY_PREFIX):], {})[key] = count
+        elif bucket.startswith(FILTER_PREFIX):
+            document["popular_filters"].setdefault(bucket[len(FILTER_PREFIX):], {})[key] = count
+    return document
+
+
+def _upsert_analytics(conn: sqlite3.Connection, deltas: AnalyticsDeltas) -> None:
+    conn.executemany(
+        "INSERT INTO analytics (bucket, key, count) VALUES (?, ?, ?) "
+        "ON CONFLICT(bucket, key) DO UPDATE SET count = count + excluded.count",
+        [(bucket, key, count) for (bucket, key), count in deltas.items()],
+    )
+
+
+class _Connection:
+    """One connection per worker process, reopened after a fork."""
+
+    def __init__(self, path: Path, views_json: Path = DEFAULT_VIEWS_JSON, analytics_json: Path = DEFAULT_ANALYTICS_JSON) -> None:
+        self._path = path
+        self._views_json = views_json
+        self._analytics_json = analytics_json
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self.lock = Lock()
+
+    def get(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = connect(self._path)
+            self._pid = os.getpid()
+            migrate_from_json(self._conn, self._views_json, self._analytics_json)
+        return self._conn
+
+    def close(self) -> None:
+        if self._conn is not None and self._pid == os.getpid():
+            self._conn.close()
+        self._conn = None
+
+
+class SqliteViewStore:
+    """View counts in SQLite; increments are buffered and written as one transaction."""
+
+    def __init__(self, path: Path | None = None, batch_size: int = DEFAULT_VIEW_BATCH) -> None:
+        self._db = _Connection(path or DEFAULT_DB_PATH)
+        self._batch_size = batch_size
+        self._pending: Counter[str] = Counter()
+        self._pending_events = 0
+
+    def load(self) -> Dict[str, int]:
+        with self._db.lock:
+            return self._read_all()
+
+    def _read_all(self) -> Dict[str, int]:
+        return {dog_id: count for dog_id, count in self._db.get().execute("SELECT dog_id, count FROM views")}
+
+    def record(self, dog_id: str, views: Dict[str, int]) -> None:
+        with self._db.lock:
+            self._pending[dog_id] += 1
+            self._pending_events += 1
+            if self._pending_events >= self._batch_size:
+                self._flush()
+
+    def _flush(self) -> None:
+        # Caller holds self._db.lock.
+        if not self._pending:
+            return
+        conn = self._db.get()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(
+                "INSERT INTO views (dog_id, count) VALUES (?, ?) "
+                "ON CONFLICT(dog_id) DO UPDATE SET count = count + excluded.count",
+                list(self._pending.items()),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self._pending.clear()
+        self._pending_events = 0
+
+    def sync(self) -> Dict[str, int]:
+        """Flush local increments and return the counts from every worker."""
+        with self._db.lock:
+            self._flush()
+            return self._read_all()
+
+    def close(self, views: Dict[str, int]) -> None:
+        with self._db.lock:
+            self._flush()
+            self._db.close()
+
+
+class SqliteAnalyticsStore:
+    """Analytics counters in SQLite, written as batched delta upserts."""
+
+    shared = True
+
+    def __init__(self, path: Path | None = None) -> None:
+        self._db = _Connection(path or DEFAULT_DB_PATH)
+
+    def load(self, keep_days: int = 90) -> Optional[Dict[str, Any]]:
+        cutoff = (datetime.utcnow() - timedelta(days=keep_days)).strftime("%Y-%m-%d")
+        with self._db.lock:
+            conn = self._db.get()
+            conn.execute(
+                "DELETE FROM analytics WHERE bucket >= ? AND bucket < ?",
+                (DAILY_PREFIX, DAILY_PREFIX + cutoff),
+            )
+            rows = conn.execute("SELECT bucket, key, count FROM analytics").fetchall()
+        return rows_to_document(rows) if rows else None
+
+    def capture(self, data: Dict[str, Any]) -> None:
+        # Deltas carry everything SQLite needs; no document snapshot required.
+        return None
+
+    def write(self, document: None, deltas: AnalyticsDeltas) -> None:
+        if not deltas:
+            return
+        with self._db.lock:
+            conn = self._db.get()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                _upsert_analytics(conn, deltas)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def read(self) -> Dict[str, Any]:
+        with self._db.lock:
+            rows = self._db.get().execute("SELECT bucket, key, count FROM analytics").fetchall()
+        return rows_to_document(rows)
+
+    def close(self) -> None:
+        with self._db.lock:
+            self._db.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Import views.json and usage.json into the SQLite store")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB_PATH, help="SQLite database path")
+    parser.add_argument("--views", type=Path, default=DEFAULT_VIEWS_JSON, help="Legacy views JSON")
+    parser.add_argument("--analytics", type=Path, default=DEFAULT_ANALYTICS_JSON, help="Legacy analytics JSON")
+    args = parser.parse_args(argv)
+
+    conn = connect(args.db)
+    try:
+        migrated = migrate_from_json(conn, args.views, args.analytics)
+    finally:
+        conn.close()
+    print(f"Migrated JSON into {args.db}" if migrated else f"{args.db} was already migrated")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
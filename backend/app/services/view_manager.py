@@ -1,32 +1,258 @@
 from __future__ import annotations
 
 import json
+import os
+import sqlite3
 from pathlib import Path
-from threading import Lock
-from typing import Dict
+from threading import Event, Lock, Thread
+from typing import Dict, List, Optional, Tuple, Union
+
+from zestie_matcher.matcher.match import ViewSnapshot
+
+from .sqlite_store import SqliteViewStore
 
 BASE_DIR = Path(__file__).resolve().parents[2]
 DEFAULT_VIEWS_PATH = BASE_DIR / "data" / "normalized" / "views.json"
+DEFAULT_VIEWS_LOG_DIR = BASE_DIR / "data" / "normalized" / "views_log"
+# Events appended to a log segment before it is folded into the snapshot.
+DEFAULT_COMPACT_EVERY = 10000
+# How often a shared store is re-read so exploration sees other workers' views.
+DEFAULT_SYNC_INTERVAL = 10.0
+# Increments carried in a snapshot's ``recent`` map before it is folded into a new base.
+DEFAULT_REBASE_EVERY = 256
 
 
-class ViewManager:
+def _read_views_json(path: Path) -> Dict[str, int]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {str(k): int(v) for k, v in data.items()}
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix(path.suffix + ".tmp")
+    temp_path.write_text(text, encoding="utf-8")
+    temp_path.replace(path)
+
+
+class JsonViewStore:
+    """Rewrites the whole views map on every increment (the original behaviour)."""
+
     def __init__(self, path: Path | None = None) -> None:
         self._path = path or DEFAULT_VIEWS_PATH
+
+    def load(self) -> Dict[str, int]:
+        return _read_views_json(self._path)
+
+    def record(self, dog_id: str, views: Dict[str, int]) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._path.write_text(json.dumps(views, indent=2), encoding="utf-8")
+
+    def close(self, views: Dict[str, int]) -> None:
+        return None
+
+
+def is_loggable_id(dog_id: str) -> bool:
+    """Log segments hold one id per line, so ids may not contain line breaks."""
+    return bool(dog_id) and "\n" not in dog_id and "\r" not in dog_id
+
+
+class LogViewStore:
+    """Appends one line per view to a log segment and periodically compacts.
+
+    Layout under ``directory``: ``snapshot.json`` holds ``{"through": n, "views": {...}}``
+    covering segments ``<= n``; ``segment-<n>.log`` files hold newline-terminated dog
+    ids. ``load()`` replays the snapshot plus every newer segment, so a crash loses at
+    most a torn final line.
+    """
+
+    def __init__(
+        self,
+        directory: Path | None = None,
+        legacy_path: Path | None = None,
+        compact_every: int = DEFAULT_COMPACT_EVERY,
+    ) -> None:
+        self._dir = directory or DEFAULT_VIEWS_LOG_DIR
+        self._legacy_path = legacy_path or DEFAULT_VIEWS_PATH
+        self._compact_every = compact_every
+        self._segment = 0
+        self._segment_events = 0
+        self._handle = None
+        self._compactor: Optional[Thread] = None
+
+    @property
+    def _snapshot_path(self) -> Path:
+        return self._dir / "snapshot.json"
+
+    def _segment_path(self, seq: int) -> Path:
+        return self._dir / f"segment-{seq:08d}.log"
+
+    def _segments(self) -> List[Tuple[int, Path]]:
+        found = []
+        for path in self._dir.glob("segment-*.log"):
+            try:
+                found.append((int(path.stem.split("-", 1)[1]), path))
+            except ValueError:
+                continue
+        return sorted(found)
+
+    def load(self) -> Dict[str, int]:
+        self._dir.mkdir(parents=True, exist_ok=True)
+        through = -1
+        views: Dict[str, int] = {}
+        try:
+            snapshot = json.loads(self._snapshot_path.read_text(encoding="utf-8"))
+            through = int(snapshot.get("through", -1))
+            views = {str(k): int(v) for k, v in (snapshot.get("views") or {}).items()}
+        except FileNotFoundError:
+            # First start in log mode: seed from the JSON map the default store writes.
+            views = _read_views_json(self._legacy_path)
+        except (json.JSONDecodeError, AttributeError, TypeError, ValueError):
+            views = {}
+        last = through
+        for seq, path in self._segments():
+            if seq <= through:
+                path.unlink(missing_ok=True)  # already folded into the snapshot
+                continue
+            text = path.read_text(encoding="utf-8")
+            lines = text.split("\n")
+            # The last element is "" for a clean file, or a torn write after a crash.
+            for dog_id in lines[:-1]:
+                if dog_id:
+                    views[dog_id] = views.get(dog_id, 0) + 1
+            last = max(last, seq)
+        self._open_segment(last + 1)
+        return views
+
+    def _open_segment(self, seq: int) -> None:
+        if self._handle is not None:
+            self._handle.close()
+        self._segment = seq
+        self._segment_events = 0
+        self._handle = self._segment_path(seq).open("a", encoding="utf-8")
+
+    def record(self, dog_id: str, views: Dict[str, int]) -> None:
+        # Called under the ViewManager lock, so appends and rotation never interleave.
+        if not is_loggable_id(dog_id):
+            raise ValueError(f"Dog id cannot be logged: {dog_id!r}")
+        self._handle.write(dog_id + "\n")
+        self._handle.flush()
+        self._segment_events += 1
+        if self._segment_events >= self._compact_every and self._compactor is None:
+            through, snapshot = self._rotate(views)
+            self._compactor = Thread(
+                target=self._compact, args=(through, snapshot), name="views-compactor", daemon=True
+            )
+            self._compactor.start()
+
+    def _rotate(self, views: Dict[str, int]) -> Tuple[int, Dict[str, int]]:
+        through = self._segment
+        self._open_segment(through + 1)
+        return through, dict(views)
+
+    def _compact(self, through: int, snapshot: Dict[str, int]) -> None:
+        try:
+            _write_atomic(self._snapshot_path, json.dumps({"through": through, "views": snapshot}, separators=(",", ":")))
+            for seq, path in self._segments():
+                if seq <= through:
+                    path.unlink(missing_ok=True)
+        finally:
+            self._compactor = None
+
+    def close(self, views: Dict[str, int]) -> None:
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+        if self._handle is None:
+            return
+        self._handle.close()
+        self._handle = None
+        if self._segment_events:
+            # Fold the open segment into the snapshot without starting another one.
+            self._compact(self._segment, dict(views))
+        else:
+            path = self._segment_path(self._segment)
+            if path.exists() and path.stat().st_size == 0:
+                path.unlink()
+
+
+ViewStore = Union[JsonViewStore, LogViewStore, SqliteViewStore]
+
+
+def make_view_store(kind: str) -> ViewStore:
+    if kind == "json":
+        return JsonViewStore()
+    if kind == "log":
+        return LogViewStore()
+    if kind == "sqlite":
+        return SqliteViewStore()
+    raise ValueError(f"Unknown views storage: {kind}")
+
+
+class ViewManager:
+    def __init__(
+        self,
+        path: Path | None = None,
+        store: Optional[ViewStore] = None,
+        sync_interval: float = DEFAULT_SYNC_INTERVAL,
+        rebase_every: int = DEFAULT_REBASE_EVERY,
+    ) -> None:
+        self._store = store or JsonViewStore(path)
         self._views: Dict[str, int] = {}
         self._lock = Lock()
+        self._version = 0
+        self._rebase_every = rebase_every
+        self._snapshot = ViewSnapshot({})
+        self._sync_interval = sync_interval
+        self._stopping = Event()
+        self._syncer: Optional[Thread] = None
 
     def load(self) -> None:
-        try:
-            text = self._path.read_text(encoding="utf-8")
-            data = json.loads(text)
-            if isinstance(data, dict):
-                self._views = {str(k): int(v) for k, v in data.items()}
-            else:
-                self._views = {}
-        except FileNotFoundError:
-            self._views = {}
-        except json.JSONDecodeError:
-            self._views = {}
+        with self._lock:
+            self._views = self._store.load()
+            self._rebase()
+
+    def start(self) -> None:
+        """Periodically pull counts written by other workers, for stores that share them."""
+        if self._syncer is not None or not hasattr(self._store, "sync"):
+            return
+        self._stopping.clear()
+        self._syncer = Thread(target=self._run, name="views-sync", daemon=True)
+        self._syncer.start()
+
+    def _run(self) -> None:
+        while not self._stopping.wait(self._sync_interval):
+            try:
+                self.sync()
+            except sqlite3.Error:
+                continue
+
+    def sync(self) -> None:
+        with self._lock:
+            self._views = self._store.sync()
+            self._version += 1
+            self._rebase()
+
+    def close(self) -> None:
+        if self._syncer is not None:
+            self._stopping.set()
+            self._syncer.join()
+            self._syncer = None
+        with self._lock:
+            self._store.close(self._views)
+
+    @property
+    def version(self) -> int:
+        """Number of increments since startup; lets caches bound how stale their view counts are."""
+        return self._version
+
+    def snapshot(self) -> ViewSnapshot:
+        """Current counts as an immutable snapshot; O(1), safe to hold across a request."""
+        return self._snapshot
 
     def get_views(self) -> Dict[str, int]:
         return dict(self._views)
@@ -35,9 +261,19 @@ class ViewManager:
         with self._lock:
             current = self._views.get(dog_id, 0) + 1
             self._views[dog_id] = current
-            self._path.parent.mkdir(parents=True, exist_ok=True)
-            self._path.write_text(json.dumps(self._views, indent=2), encoding="utf-8")
+            self._version += 1
+            self._store.record(dog_id, self._views)
+            if self._snapshot.recent_size >= self._rebase_every:
+                self._rebase()
+            else:
+                self._snapshot = self._snapshot.updated(dog_id, current, self._version)
             return current
 
+    def _rebase(self) -> None:
+        # Caller holds self._lock. Snapshots never alias the mutable map.
+        self._snapshot = ViewSnapshot(dict(self._views), version=self._version)
+
 
-view_manager = ViewManager()
+# "json" (default) rewrites views.json per click; "log" appends to a compacted event log;
+# "sqlite" shares batched counts with every worker through one database.
+view_manager = ViewManager(store=make_view_store(os.environ.get("ZESTIE_VIEWS_STORAGE", "json")))
@@ -1 +1 @@
-from .match import rank_dogs, score_dog, load_normalized_feed, Preference, load_views  # noqa: F401
+from .match import rank_dogs, score_dog, load_normalized_feed, Preference, load_views, DogIndex, score_index, explain_dog, select_ranked, ViewSnapshot, RankedSlot, select_slots, materialize_slots  # noqa: F401
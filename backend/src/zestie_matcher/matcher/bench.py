@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Micro-benchmark for the ranking tail as a chat session's seen list grows."""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from .match import (
+    DEFAULT_EXPLORE_SLOTS,
+    DEFAULT_FEED_PATH,
+    DEFAULT_TOP_N,
+    DogIndex,
+    load_normalized_feed,
+    rank_dogs,
+)
+
+
+def time_tail(index: DogIndex, seen_ids: List[str], repeats: int) -> Dict[str, Any]:
+    """Time rank_dogs with the seen ids excluded, mirroring /api/recommend."""
+    samples: List[float] = []
+    returned = 0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        ranked = rank_dogs(
+            index,
+            [],
+            top_n=DEFAULT_TOP_N,
+            source_cap=6,
+            exploration_slots=DEFAULT_EXPLORE_SLOTS,
+            exclude_ids=set(seen_ids),
+        )
+        samples.append((time.perf_counter() - start) * 1000)
+        returned = len(ranked)
+    return {
+        "seen": len(seen_ids),
+        "returned": returned,
+        "median_ms": round(statistics.median(samples), 3),
+        "max_ms": round(max(samples), 3),
+    }
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark ranking latency against growing seen_dog_ids")
+    parser.add_argument("--feed", type=Path, default=DEFAULT_FEED_PATH, help="Path to normalized dogs JSON")
+    parser.add_argument("--seen", type=int, nargs="+", default=[0, 100, 1000, 5000, 20000], help="seen_dog_ids sizes to try")
+    parser.add_argument("--repeats", type=int, default=20, help="Timed runs per size")
+    args = parser.parse_args(argv)
+
+    dogs = load_normalized_feed(args.feed)
+    index = DogIndex(dogs)
+    for size in args.seen:
+        # Real feed ids first (so pages come from deeper in the ranking), then unknown ids.
+        seen_ids = [dog["id"] for dog in dogs[:size]] + [f"bench:{i}" for i in range(max(0, size - len(dogs)))]
+        print(json.dumps(time_tail(index, seen_ids, args.repeats)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
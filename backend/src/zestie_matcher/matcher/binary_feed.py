@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""Compact binary feed (``dogs.bin``) that API workers memory-map instead of parsing JSON.
+
+Layout: ``MAGIC``, a little header (uint32 length + JSON) and 8-byte aligned
+sections addressed by offsets relative to the end of the header:
+
+* ``status`` / ``completeness`` (float64) and ``special_needs`` (int8) per dog;
+* ``codes:<field>`` (int32) dictionary codes for every DogIndex column, whose
+  distinct values live in the header;
+* ``<name>.offsets`` (int64, count + 1) into ``<name>.blob`` for ``ids``,
+  pre-encoded ``cards`` and full ``dogs`` JSON.
+
+Every section is used in place through the mmap, so forked or sibling workers
+share one copy in the page cache and a dog is only decoded when it is served.
+
+    PYTHONPATH=backend/src python -m zestie_matcher.matcher.binary_feed
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .feed_stream import read_feed
+from .match import DEFAULT_FEED_PATH, MATCHABLE_FIELDS, Column, DogIndex
+from .projection import project_card
+
+MAGIC = b"ZSTFEED1"
+FORMAT_VERSION = 1
+DEFAULT_BINARY_FEED_PATH = DEFAULT_FEED_PATH.with_suffix(".bin")
+_HEADER_LENGTH = struct.Struct("<I")
+# DogIndex columns derived from several fields, stored next to the raw MATCHABLE_FIELDS.
+_DERIVED_COLUMNS = ("source", "location_label", "location_state", "sex")
+
+
+def _encode(value: Any) -> bytes:
+    # Same settings as Starlette's JSONResponse, so cards can be spliced into responses.
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def _column_name(field: str, derived: bool = False) -> str:
+    return f"codes:@{field}" if derived else f"codes:{field}"
+
+
+class _Blobs(Sequence):
+    """``bytes`` per dog, sliced out of a blob section by an offset table."""
+
+    def __init__(self, offsets: memoryview, blob: memoryview) -> None:
+        self._offsets = offsets
+        self._blob = blob
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i: int) -> bytes:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return bytes(self._blob[self._offsets[i]:self._offsets[i + 1]])
+
+
+class _Dogs(Sequence):
+    """Normalized dogs decoded on access; nothing is kept per dog between calls."""
+
+    def __init__(self, blobs: _Blobs) -> None:
+        self._blobs = blobs
+
+    def __len__(self) -> int:
+        return len(self._blobs)
+
+    def __getitem__(self, i: int) -> Dict[str, Any]:
+        return json.loads(self._blobs[i])
+
+
+class BinaryFeed:
+    """Read-only view over a memory-mapped ``dogs.bin``."""
+
+    def __init__(self, path: Path = DEFAULT_BINARY_FEED_PATH) -> None:
+        with path.open("rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._map)
+        if bytes(view[: len(MAGIC)]) != MAGIC:
+            raise ValueError(f"{path} is not a binary dog feed")
+        (header_length,) = _HEADER_LENGTH.unpack_from(view, len(MAGIC))
+        start = len(MAGIC) + _HEADER_LENGTH.size
+        header = json.loads(bytes(view[start:start + header_length]))
+        if header.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported binary feed version: {header.get('version')}")
+        if header.get("byteorder") != sys.byteorder:
+            raise ValueError("Binary feed was written on a machine with a different byte order")
+        self._view = view
+        self._data_offset = _aligned(start + header_length)
+        self._sections: Dict[str, List[int]] = header["sections"]
+        self._values: Dict[str, List[Any]] = header["columns"]
+        self.count: int = header["count"]
+        self.meta: Dict[str, Any] = header.get("meta") or {}
+
+    def _section(self, name: str, typecode: str) -> memoryview:
+        offset, length = self._sections[name]
+        start = self._data_offset + offset
+        return self._view[start:start + length].cast(typecode)
+
+    def _blobs(self, name: str) -> _Blobs:
+        return _Blobs(self._section(f"{name}.offsets", "q"), self._section(f"{name}.blob", "B"))
+
+    def _column(self, name: str) -> Column:
+        return Column(codes=self._section(name, "i"), values=tuple(self._values[name]))
+
+    @property
+    def dogs(self) -> _Dogs:
+        return _Dogs(self._blobs("dogs"))
+
+    @property
+    def cards(self) -> _Blobs:
+        return self._blobs("cards")
+
+    def index(self) -> DogIndex:
+        ids = [dog_id.decode("utf-8") for dog_id in self._blobs("ids")]
+        derived = {field: self._column(_column_name(field, derived=True)) for field in _DERIVED_COLUMNS}
+        return DogIndex.from_columns(
+            self.dogs,
+            ids,
+            status=self._section("status", "d"),
+            completeness=self._section("completeness", "d"),
+            special_needs=self._section("special_needs", "b"),
+            fields={field: self._column(_column_name(field)) for field in MATCHABLE_FIELDS},
+            **derived,
+        )
+
+
+def _aligned(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _blob_sections(name: str, items: Iterable[bytes]) -> List[Tuple[str, bytes]]:
+    offsets = array("q", [0])
+    chunks: List[bytes] = []
+    for item in items:
+        chunks.append(item)
+        offsets.append(offsets[-1] + len(item))
+    return [(f"{name}.offsets", offsets.tobytes()), (f"{name}.blob", b"".join(chunks))]
+
+
+def write_binary_feed(data: Dict[str, Any], output: Path) -> None:
+    """Write the feed document ``data`` (as produced by normalize_dogs) to ``output``."""
+    dogs = data.get("dogs") or []
+    index = DogIndex(dogs)
+    sections: List[Tuple[str, bytes]] = [
+        ("status", index.status.tobytes()),
+        ("completeness", index.completeness.tobytes()),
+        ("special_needs", index.special_needs.tobytes()),
+    ]
+    columns: Dict[str, List[Any]] = {}
+    encoded = [(_column_name(field, derived=True), getattr(index, field)) for field in _DERIVED_COLUMNS]
+    encoded += [(_column_name(field), index.column(field)) for field in MATCHABLE_FIELDS]
+    for name, column in encoded:
+        sections.append((name, column.codes.tobytes()))
+        columns[name] = list(column.values)
+    sections += _blob_sections("ids", (dog_id.encode("utf-8") for dog_id in index.ids))
+    sections += _blob_sections("cards", (_encode(project_card(dog)) for dog in dogs))
+    sections += _blob_sections("dogs", (json.dumps(dog, ensure_ascii=False, separators=(",", ":")).encode("utf-8") for dog in dogs))
+
+    table: Dict[str, List[int]] = {}
+    offset = 0
+    for name, payload in sections:
+        table[name] = [offset, len(payload)]
+        offset = _aligned(offset + len(payload))
+    header = json.dumps(
+        {
+            "version": FORMAT_VERSION,
+            "byteorder": sys.byteorder,
+            "count": len(dogs),
+            "meta": {key: value for key, value in data.items() if key != "dogs"},
+            "sections": table,
+            "columns": columns,
+        },
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    # Replace by rename: workers still mapping the old file keep their (unlinked) inode.
+    temp_path = output.with_suffix(output.suffix + ".tmp")
+    with temp_path.open("wb") as f:
+        f.write(MAGIC)
+        f.write(_HEADER_LENGTH.pack(len(header)))
+        f.write(header)
+        position = len(MAGIC) + _HEADER_LENGTH.size + len(header)
+        f.write(b"\0" * (_aligned(position) - position))
+        for name, payload in sections:
+            f.write(payload)
+            f.write(b"\0" * (_aligned(len(payload)) - len(payload)))
+    temp_path.replace(output)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Convert a normalized dogs.json into the binary feed format")
+    parser.add_argument("--feed", type=Path, default=DEFAULT_FEED_PATH, help="Normalized feed (JSON or NDJSON)")
+    parser.add_argument("--output", type=Path, default=DEFAULT_BINARY_FEED_PATH, help="Binary feed output path")
+    args = parser.parse_args(argv)
+
+    data = read_feed(args.feed)
+    write_binary_feed(data, args.output)
+    print(f"Wrote {len(data.get('dogs') or [])} dogs to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
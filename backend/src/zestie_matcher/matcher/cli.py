@@ -12,8 +12,10 @@ from .match import (
     DEFAULT_EXPLORATION_K,
     DEFAULT_EXPLORE_SLOTS,
     DEFAULT_MIN_CORE,
+    DEFAULT_SCORING_BACKEND,
     DEFAULT_SOURCE_CAP,
     DEFAULT_TOP_N,
+    SCORING_BACKENDS,
     Preference,
     load_normalized_feed,
     load_views,
@@ -57,6 +59,7 @@ def main(argv: List[str] | None = None) -> int:
     parser.add_argument("--min-core", type=float, default=DEFAULT_MIN_CORE, help="Minimum core_score gate for exploration candidates")
     parser.add_argument("--min-completeness", type=float, default=0.0, help="Minimum completeness for explore candidates")
     parser.add_argument("--exploration-k", type=float, default=DEFAULT_EXPLORATION_K, help="k value for views-based exploration bonus")
+    parser.add_argument("--backend", choices=SCORING_BACKENDS, default=DEFAULT_SCORING_BACKEND, help="Scoring backend (numpy is optional)")
     parser.add_argument("--pretty", action="store_true", help="Pretty-print JSON output")
     args = parser.parse_args(argv)
 
@@ -76,6 +79,7 @@ def main(argv: List[str] | None = None) -> int:
         exploration_k=args.exploration_k,
         min_core_score=args.min_core,
         min_completeness=args.min_completeness,
+        backend=args.backend,
     )
     output = [
         {
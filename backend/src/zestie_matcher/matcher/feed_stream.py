@@ -0,0 +1,281 @@
+"""Streamed layouts of the normalized feed, written one dog at a time.
+
+Besides the indented ``dogs.json`` document the normalizer can emit:
+
+* ``compact``: the same JSON object, written as ``{"dogs":[`` followed by one
+  compact dog per line and a trailer holding ``fetched_at``/``count``/``sources``.
+  Anything that ``json.load``s the feed sees the same keys.
+* ``ndjson``: one dog per line in a ``.ndjson``/``.jsonl`` file, with the header
+  fields in a ``.meta.json`` sidecar.
+
+Neither needs the full list of dogs in memory to be written, and
+``StreamedDocument`` reads them back (or a large raw scrape file) one element
+at a time, so readers hold a single record rather than the parsed file.
+"""
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import Any, Collection, Dict, Iterator, Optional, TextIO
+
+FEED_FORMATS = ("json", "compact", "ndjson")
+NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+# Top-level arrays streamed by default: normalized feeds and most scrapes use
+# "dogs", the NYCACC feed "pets".
+DEFAULT_ARRAY_KEYS = ("dogs", "pets")
+DEFAULT_CHUNK_SIZE = 1 << 16
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_NUMBER_TAIL = re.compile(r"[0-9.eE+-]*")
+_DECODER = json.JSONDecoder()
+
+
+def is_ndjson(path: Path) -> bool:
+    return path.suffix in NDJSON_SUFFIXES
+
+
+def header_path(path: Path) -> Path:
+    """Sidecar holding the header fields of an NDJSON feed."""
+    return path.with_suffix(".meta.json")
+
+
+def _encode(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"))
+
+
+class FeedWriter:
+    """Write a feed in the ``compact`` or ``ndjson`` layout, then move it into place.
+
+    Dogs go to a temporary file as they are written; ``close`` adds the header
+    (as a trailer, or the NDJSON sidecar) and renames the file over ``output``,
+    so a watching API never sees a partial feed. ``abort`` discards it.
+    """
+
+    def __init__(self, output: Path, feed_format: str) -> None:
+        if feed_format not in ("compact", "ndjson"):
+            raise ValueError(f"Not a streamed feed format: {feed_format}")
+        if (feed_format == "ndjson") != is_ndjson(output):
+            raise ValueError(f"{output}: NDJSON feeds need a {' or '.join(NDJSON_SUFFIXES)} suffix (and only they may use it)")
+        self.output = output
+        self.count = 0
+        self._ndjson = feed_format == "ndjson"
+        output.parent.mkdir(parents=True, exist_ok=True)
+        self._temp_path = output.with_suffix(output.suffix + ".tmp")
+        self._file: Optional[TextIO] = self._temp_path.open("w", encoding="utf-8")
+        if not self._ndjson:
+            self._file.write('{"dogs":[')
+
+    def write(self, dog: Dict[str, Any]) -> None:
+        assert self._file is not None, "writer is closed"
+        if self._ndjson:
+            self._file.write(_encode(dog) + "\n")
+        else:
+            self._file.write(("\n" if self.count == 0 else ",\n") + _encode(dog))
+        self.count += 1
+
+    def close(self, header: Dict[str, Any]) -> None:
+        """Finish the feed with ``header`` (every top-level key except ``dogs``)."""
+        assert self._file is not None, "writer is closed"
+        header = {key: value for key, value in header.items() if key != "dogs"}
+        with self._file:
+            if not self._ndjson:
+                trailer = _encode(header)[1:-1]
+                self._file.write("\n]" + ("," + trailer if trailer else "") + "}\n")
+        self._file = None
+        if self._ndjson:
+            sidecar = header_path(self.output)
+            sidecar_temp = sidecar.with_suffix(sidecar.suffix + ".tmp")
+            sidecar_temp.write_text(json.dumps(header, indent=2), encoding="utf-8")
+            sidecar_temp.replace(sidecar)
+        self._temp_path.replace(self.output)
+
+    def abort(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._temp_path.unlink(missing_ok=True)
+
+
+class _Reader:
+    """Tokens and whole JSON values pulled from a text file through a sliding buffer."""
+
+    def __init__(self, f: TextIO, chunk_size: int) -> None:
+        self._file = f
+        self._chunk_size = chunk_size
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, size: int) -> bool:
+        """Append up to ``size`` characters, dropping what has been consumed."""
+        if self._eof:
+            return False
+        chunk = self._file.read(size)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """The next non-whitespace character ("" at end of file)."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()  # type: ignore[union-attr]
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill(self._chunk_size):
+                return ""
+
+    def expect(self, chars: str) -> str:
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"Expected one of {chars!r} in JSON stream, found {char or 'end of file'!r}")
+        self._pos += 1
+        return char
+
+    def value(self) -> Any:
+        self.peek()
+        size = self._chunk_size
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # Most likely the value runs past the buffer; grow the read each time so
+                # one large value costs O(log n) retries rather than one per chunk.
+                if not self._fill(size):
+                    raise
+                size *= 2
+                continue
+            # A number running up to the buffer edge may continue in the file ("12" + ".5").
+            if (
+                isinstance(value, (int, float))
+                and _NUMBER_TAIL.match(self._buffer, end).end() == len(self._buffer)  # type: ignore[union-attr]
+                and self._fill(size)
+            ):
+                continue
+            self._pos = end
+            return value
+
+
+class StreamedDocument:
+    """A top-level JSON object whose big array is read one element at a time.
+
+    Fields before the array (the first of ``array_keys`` found) are parsed into
+    ``header`` when the document is opened; ``items()`` then yields the array's
+    elements and afterwards adds any trailing fields to ``header``. NDJSON files
+    yield one element per line and take their header from the ``.meta.json``
+    sidecar. A missing file raises ``FileNotFoundError`` unless ``missing_ok``,
+    in which case it reads as an empty document.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        array_keys: Collection[str] = DEFAULT_ARRAY_KEYS,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        missing_ok: bool = False,
+    ) -> None:
+        self.path = path
+        self.header: Dict[str, Any] = {}
+        self.array_key: Optional[str] = None
+        self.count = 0
+        self._file: Optional[TextIO] = None
+        self._reader: Optional[_Reader] = None
+        self._fields_read = 0
+        self._started = False
+        if not path.exists():
+            if missing_ok:
+                return
+            raise FileNotFoundError(f"{path} does not exist")
+        if is_ndjson(path):
+            sidecar = header_path(path)
+            if sidecar.exists():
+                self.header = json.loads(sidecar.read_text(encoding="utf-8"))
+            self._file = path.open(encoding="utf-8")
+            return
+        self._file = path.open(encoding="utf-8")
+        try:
+            self._reader = _Reader(self._file, chunk_size)
+            self._reader.expect("{")
+            self._read_fields(array_keys)
+        except BaseException:
+            self.close()
+            raise
+
+    def __enter__(self) -> "StreamedDocument":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """A header field (the streamed array is only available through ``items``)."""
+        return self.header.get(key, default)
+
+    def _read_fields(self, array_keys: Collection[str]) -> None:
+        reader = self._reader
+        assert reader is not None
+        while True:
+            if reader.peek() == "}":
+                reader.expect("}")
+                self.close()
+                return
+            if self._fields_read:
+                reader.expect(",")
+            self._fields_read += 1
+            key = reader.value()
+            if not isinstance(key, str):
+                raise ValueError(f"{self.path}: expected an object key, found {key!r}")
+            reader.expect(":")
+            if self.array_key is None and key in array_keys and reader.peek() == "[":
+                reader.expect("[")
+                self.array_key = key
+                return
+            self.header[key] = reader.value()
+
+    def items(self) -> Iterator[Any]:
+        """Yield the streamed array's elements; can only be iterated once."""
+        if self._started:
+            raise RuntimeError(f"{self.path} has already been read")
+        self._started = True
+        if self._file is None:
+            return
+        try:
+            if self._reader is None:
+                for line in self._file:
+                    if line.strip():
+                        self.count += 1
+                        yield json.loads(line)
+            elif self.array_key is not None:
+                reader = self._reader
+                if reader.peek() == "]":
+                    reader.expect("]")
+                else:
+                    while True:
+                        item = reader.value()
+                        self.count += 1
+                        yield item
+                        if reader.expect(",]") == "]":
+                            break
+                self._read_fields(())
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def iter_feed_dogs(path: Path) -> Iterator[Dict[str, Any]]:
+    """Dogs of the feed at ``path``, in any layout, decoded one at a time."""
+    with StreamedDocument(path, ("dogs",)) as document:
+        yield from document.items()
+
+
+def read_feed(path: Path) -> Dict[str, Any]:
+    """The feed document at ``path`` (header fields plus ``dogs``), in any layout."""
+    with StreamedDocument(path, ("dogs",)) as document:
+        dogs = list(document.items())
+        return {**document.header, "dogs": dogs}
@@ -1,11 +1,19 @@
 """Matcher & ranker with completeness-aware explore slots and structured reasons."""
 from __future__ import annotations
 
+import base64
+import heapq
+import itertools
 import json
 import math
+import zlib
+from array import array
+from collections.abc import Mapping
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Callable, Collection, Dict, Hashable, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from .feed_stream import iter_feed_dogs
 
 BASE_DIR = Path(__file__).resolve().parents[3]
 DEFAULT_FEED_PATH = BASE_DIR / "data/normalized/dogs.json"
@@ -17,6 +25,9 @@ DEFAULT_EXPLORE_SLOTS = 6
 DEFAULT_SOURCE_CAP = None
 DEFAULT_EXPLORATION_K = 0.1
 DEFAULT_MIN_CORE = 0.0
+# "auto" uses the NumPy backend when numpy is importable, else the pure-Python reference.
+SCORING_BACKENDS = ("auto", "python", "numpy")
+DEFAULT_SCORING_BACKEND = "auto"
 
 # Key fields counted toward completeness
 COMPLETENESS_FIELDS = [
@@ -38,6 +49,10 @@ COMPLETENESS_FIELDS = [
 SIZE_ORDER = ["XS", "S", "M", "L", "XL"]
 AGE_ORDER = ["Puppy", "Young", "Adult", "Senior"]
 
+# Fields encoded eagerly when a DogIndex is built; anything else a preference
+# targets is encoded on first use.
+MATCHABLE_FIELDS = COMPLETENESS_FIELDS + ["sex", "source_id", "apartment_ok", "hypoallergenic", "requires_fenced_yard"]
+
 
 @dataclass
 class Preference:
@@ -49,9 +64,8 @@ class Preference:
 
 
 def load_normalized_feed(path: Path = DEFAULT_FEED_PATH) -> List[Dict[str, Any]]:
-    with path.open(encoding="utf-8") as f:
-        data = json.load(f)
-    return data.get("dogs") or []
+    # Decoded dog by dog, so the whole file's text and parse tree never coexist with the list.
+    return list(iter_feed_dogs(path))
 
 
 def load_views(path: Path = DEFAULT_VIEWS_PATH) -> Dict[str, int]:
@@ -220,7 +234,7 @@ def preferences_score(preferences: Iterable[Preference], dog: Dict[str, Any]) ->
     return total, drop, reasons
 
 
-def exploration_bonus(dog_id: str, views: Dict[str, int], k: float = DEFAULT_EXPLORATION_K) -> float:
+def exploration_bonus(dog_id: str, views: Mapping[str, int], k: float = DEFAULT_EXPLORATION_K) -> float:
     seen = views.get(dog_id, 0)
     return k / math.sqrt(1 + seen)
 
@@ -229,17 +243,14 @@ def score_dog(
     dog: Dict[str, Any],
     desired: Dict[str, Any],
     preferences: Iterable[Preference],
-    views: Optional[Dict[str, int]] = None,
+    views: Optional[Mapping[str, int]] = None,
     exploration_k: float = DEFAULT_EXPLORATION_K,
 ) -> Optional[Dict[str, Any]]:
     pref_list = list(preferences)
     pref_score, drop, pref_reasons = preferences_score(pref_list, dog)
     if drop:
         return None
-    opted_in_special = any(
-        p.field == "special_needs" and p.value is True and p.hardness.lower() in ("nice", "strong", "must")
-        for p in pref_list
-    )
+    opted_in_special = opted_in_special_needs(pref_list)
     base, base_reasons = base_score(dog, desired, opted_in_special_needs=opted_in_special)
     core_score = base + pref_score
     bonus = exploration_bonus(dog["id"], views or {}, exploration_k)
@@ -257,6 +268,17 @@ def score_dog(
     }
 
 
+def explain_dog(dog: Dict[str, Any], desired: Dict[str, Any], preferences: Iterable[Preference]) -> List[Dict[str, Any]]:
+    """Structured reasons for one dog, matching what score_dog reports.
+
+    Ranking scores numerically and only calls this for the dogs that make the page.
+    """
+    pref_list = list(preferences)
+    _, _, pref_reasons = preferences_score(pref_list, dog)
+    _, base_reasons = base_score(dog, desired, opted_in_special_needs=opted_in_special_needs(pref_list))
+    return pref_reasons + base_reasons
+
+
 def apply_source_cap(scored: List[Dict[str, Any]], cap: Optional[int]) -> List[Dict[str, Any]]:
     if cap is None or cap <= 0:
         return scored
@@ -270,11 +292,396 @@ def apply_source_cap(scored: List[Dict[str, Any]], cap: Optional[int]) -> List[D
     return picked
 
 
+def _value_key(value: Any) -> Hashable:
+    # Keep True/1/1.0 apart: preference_contribution treats bools specially.
+    try:
+        hash(value)
+    except TypeError:
+        return (type(value), repr(value))
+    return (type(value), value)
+
+
+@dataclass(frozen=True)
+class Column:
+    """Dictionary-encoded column: one int code per dog pointing into ``values``."""
+
+    codes: Sequence[int]
+    values: Tuple[Any, ...]
+
+    def map(self, fn: Callable[[Any], Any]) -> List[Any]:
+        """Evaluate ``fn`` once per distinct value and expand it to one result per dog."""
+        table = [fn(value) for value in self.values]
+        return [table[code] for code in self.codes]
+
+
+def encode_column(values: Iterable[Any]) -> Column:
+    lookup: Dict[Hashable, int] = {}
+    distinct: List[Any] = []
+    codes = array("i")
+    for value in values:
+        key = _value_key(value)
+        code = lookup.get(key)
+        if code is None:
+            code = len(distinct)
+            lookup[key] = code
+            distinct.append(value)
+        codes.append(code)
+    return Column(codes=codes, values=tuple(distinct))
+
+
+class DogIndex:
+    """Columnar view of the feed, built once per load and shared by every ranking call.
+
+    Per-dog constants (status score, completeness, lowered location strings, source)
+    are precomputed; matchable fields are dictionary-encoded so a preference is
+    evaluated once per distinct value instead of once per dog.
+    """
+
+    def __init__(self, dogs: Sequence[Dict[str, Any]]) -> None:
+        self.dogs = dogs
+        self._index_ids([dog["id"] for dog in dogs])
+        self.status: Sequence[float] = array("d", (status_score(dog.get("status")) for dog in dogs))
+        self.completeness: Sequence[float] = array("d", (completeness_score(dog) for dog in dogs))
+        self.special_needs: Sequence[int] = array("b", (dog.get("special_needs") is True for dog in dogs))
+        self.source = encode_column(dog.get("source_id") or "unknown" for dog in dogs)
+        self.location_label = encode_column((dog.get("location_label") or "").lower() for dog in dogs)
+        self.location_state = encode_column((dog.get("location_state") or "").lower() for dog in dogs)
+        self.sex = encode_column(str(dog.get("sex") or "").lower() for dog in dogs)
+        self._fields: Dict[str, Column] = {}
+        for field in MATCHABLE_FIELDS:
+            self.column(field)
+
+    @classmethod
+    def from_columns(
+        cls,
+        dogs: Sequence[Dict[str, Any]],
+        ids: List[str],
+        status: Sequence[float],
+        completeness: Sequence[float],
+        special_needs: Sequence[int],
+        source: Column,
+        location_label: Column,
+        location_state: Column,
+        sex: Column,
+        fields: Dict[str, Column],
+    ) -> "DogIndex":
+        """Assemble an index from columns computed elsewhere (e.g. a binary feed)."""
+        index = cls.__new__(cls)
+        index.dogs = dogs
+        index._index_ids(ids)
+        index.status = status
+        index.completeness = completeness
+        index.special_needs = special_needs
+        index.source = source
+        index.location_label = location_label
+        index.location_state = location_state
+        index.sex = sex
+        index._fields = dict(fields)
+        return index
+
+    def _index_ids(self, ids: List[str]) -> None:
+        self.ids = ids
+        # Feeds can repeat an id; positions keeps the first, duplicates the rest.
+        self.positions: Dict[str, int] = {}
+        self.duplicates: Dict[str, List[int]] = {}
+        for i, dog_id in enumerate(ids):
+            if dog_id in self.positions:
+                self.duplicates.setdefault(dog_id, []).append(i)
+            else:
+                self.positions[dog_id] = i
+
+    def __len__(self) -> int:
+        return len(self.dogs)
+
+    def locate(self, dog_id: str) -> List[int]:
+        """All positions holding ``dog_id`` (empty when it is not in the feed)."""
+        first = self.positions.get(dog_id)
+        if first is None:
+            return []
+        return [first, *self.duplicates.get(dog_id, ())]
+
+    def column(self, field: str) -> Column:
+        """Encoded raw values of ``field``; fields outside MATCHABLE_FIELDS are encoded lazily."""
+        column = self._fields.get(field)
+        if column is None:
+            column = encode_column(dog.get(field) for dog in self.dogs)
+            self._fields[field] = column
+        return column
+
+
+@dataclass
+class ScoredFeed:
+    """Numeric scores aligned with a DogIndex; ``keep[i]`` is False when a must failed."""
+
+    keep: Sequence[bool]
+    base: Sequence[float]
+    pref: Sequence[float]
+    core: Sequence[float]
+    bonus: Sequence[float]
+    final: Sequence[float]
+
+    def compact(self) -> "ScoredFeed":
+        """Copy into typed arrays (8 bytes per score) for long-lived storage such as caches."""
+        return ScoredFeed(
+            keep=array("b", (bool(kept) for kept in self.keep)),
+            base=array("d", self.base),
+            pref=array("d", self.pref),
+            core=array("d", self.core),
+            bonus=array("d", self.bonus),
+            final=array("d", self.final),
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the score arrays (meaningful once ``compact``-ed)."""
+        columns = (self.keep, self.base, self.pref, self.core, self.bonus, self.final)
+        return sum(len(column) * getattr(column, "itemsize", 8) for column in columns)
+
+
+@dataclass(frozen=True)
+class RankedSlot:
+    """One selected dog: its feed position, section and score components."""
+
+    position: int
+    section: str
+    base_score: float
+    pref_score: float
+    core_score: float
+    exploration_bonus: float
+    final_score: float
+
+
+def opted_in_special_needs(preferences: Iterable[Preference]) -> bool:
+    return any(
+        p.field == "special_needs" and p.value is True and p.hardness.lower() in ("nice", "strong", "must")
+        for p in preferences
+    )
+
+
+_VIEW_BASE_IDS = itertools.count(1)
+
+
+class ViewSnapshot(Mapping):
+    """Immutable view counts that rankers share without copying.
+
+    ``base`` is a dict frozen at publication and ``recent`` a small dict of counts
+    changed since; a writer publishes a new snapshot per increment (copying only
+    ``recent``) and folds ``recent`` into a fresh base once it grows. Neither dict
+    is mutated after the snapshot is built, so readers see one consistent state.
+    Snapshots derived from one base share its aligned array, so each only copies
+    it and patches in ``recent`` instead of walking the whole base again.
+    ``base_id`` identifies the base within this process, so a base shipped to
+    another process once can be reused there with each new ``recent``.
+    """
+
+    __slots__ = ("version", "base_id", "_base", "_recent", "_aligned", "_base_aligned")
+
+    def __init__(self, base: Dict[str, int], recent: Optional[Dict[str, int]] = None, version: int = 0) -> None:
+        self.version = version
+        self.base_id = next(_VIEW_BASE_IDS)
+        self._base = base
+        self._recent = recent or {}
+        self._aligned: Optional[Tuple[DogIndex, array]] = None
+        # One slot shared by every snapshot with this base: (index, base counts).
+        self._base_aligned: List[Optional[Tuple[DogIndex, array]]] = [None]
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # The aligned-array cache refers to a DogIndex; never ship it across processes.
+        return (ViewSnapshot, (self._base, self._recent, self.version))
+
+    @property
+    def base(self) -> Mapping:
+        return self._base
+
+    @property
+    def recent(self) -> Mapping:
+        return self._recent
+
+    @property
+    def recent_size(self) -> int:
+        return len(self._recent)
+
+    def with_recent(self, recent: Dict[str, int], version: int) -> "ViewSnapshot":
+        """A snapshot over the same base (sharing its aligned counts) with ``recent`` on top."""
+        snapshot = ViewSnapshot(self._base, recent, version)
+        snapshot.base_id = self.base_id
+        snapshot._base_aligned = self._base_aligned
+        return snapshot
+
+    def updated(self, dog_id: str, count: int, version: int) -> "ViewSnapshot":
+        recent = dict(self._recent)
+        recent[dog_id] = count
+        return self.with_recent(recent, version)
+
+    def get(self, dog_id: str, default: Any = None) -> Any:
+        count = self._recent.get(dog_id)
+        if count is None:
+            return self._base.get(dog_id, default)
+        return count
+
+    def __getitem__(self, dog_id: str) -> int:
+        count = self.get(dog_id)
+        if count is None:
+            raise KeyError(dog_id)
+        return count
+
+    def __contains__(self, dog_id: object) -> bool:
+        return dog_id in self._recent or dog_id in self._base
+
+    def __len__(self) -> int:
+        return len(self._base) + sum(1 for dog_id in self._recent if dog_id not in self._base)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._base
+        for dog_id in self._recent:
+            if dog_id not in self._base:
+                yield dog_id
+
+    def aligned(self, index: DogIndex) -> array:
+        """Counts as an int64 array aligned with ``index`` positions, built once per snapshot.
+
+        The base's counts are aligned once per base and index; each snapshot then
+        copies that array (a memcpy) and patches only its ``recent`` counts.
+        """
+        cached = self._aligned
+        if cached is not None and cached[0] is index:
+            return cached[1]
+        base_cached = self._base_aligned[0]
+        if base_cached is None or base_cached[0] is not index:
+            base_counts = array("q", bytes(8 * len(index)))
+            for dog_id, count in self._base.items():
+                for position in index.locate(dog_id):
+                    base_counts[position] = count
+            base_cached = (index, base_counts)
+            self._base_aligned[0] = base_cached
+        counts = array("q", base_cached[1]) if self._recent else base_cached[1]
+        for dog_id, count in self._recent.items():
+            for position in index.locate(dog_id):
+                counts[position] = count
+        self._aligned = (index, counts)
+        return counts
+
+
+def score_index(
+    index: DogIndex,
+    preferences: Iterable[Preference],
+    desired: Optional[Dict[str, Any]] = None,
+    views: Optional[Mapping[str, int]] = None,
+    exploration_k: float = DEFAULT_EXPLORATION_K,
+) -> ScoredFeed:
+    """Column-wise equivalent of running score_dog over every dog in ``index``.
+
+    Component order and arithmetic mirror preferences_score/base_score exactly so
+    the resulting scores (and therefore ranking ties) are bit-identical.
+    """
+    desired = desired or {}
+    views = views or {}
+    pref_list = list(preferences)
+    n = len(index)
+
+    keep = [True] * n
+    pref_total = [0.0] * n
+    active_weights = 0.0
+    for pref in pref_list:
+        contributions = index.column(pref.field).map(
+            lambda value, pref=pref: preference_contribution(pref, {pref.field: value})[:2]
+        )
+        for i, (contribution, should_drop) in enumerate(contributions):
+            if should_drop:
+                keep[i] = False
+            else:
+                pref_total[i] += contribution
+        active_weights += abs(pref.weight)
+    if active_weights > 0:
+        pref_total = [total / active_weights for total in pref_total]
+
+    totals = list(index.status)
+    counts = [1] * n
+    if not opted_in_special_needs(pref_list):
+        for i, flagged in enumerate(index.special_needs):
+            if flagged:
+                totals[i] += 0.6
+                counts[i] += 1
+    loc_pref = desired.get("location_label")
+    if loc_pref:
+        wants = loc_pref.lower()
+        wants_state = (desired.get("location_state") or "").lower()
+        label_hits = index.location_label.map(lambda label: label == wants)
+        state_hits = index.location_state.map(lambda state: bool(wants_state) and state == wants_state)
+        for i in range(n):
+            totals[i] += 1.0 if label_hits[i] else 0.7 if state_hits[i] else 0.4
+            counts[i] += 1
+    for field, order in (("size", SIZE_ORDER), ("age_group", AGE_ORDER)):
+        target = desired.get(field)
+        if not target:
+            continue
+        closeness_values = index.column(field).map(lambda value: closeness(value, target, order))
+        for i, component in enumerate(closeness_values):
+            if component is not None:
+                totals[i] += component
+                counts[i] += 1
+    base = [total / count for total, count in zip(totals, counts)]
+
+    core = [b + p for b, p in zip(base, pref_total)]
+    if isinstance(views, ViewSnapshot):
+        bonus = [exploration_k / math.sqrt(1 + seen) for seen in views.aligned(index)]
+    else:
+        bonus = [exploration_bonus(dog_id, views, exploration_k) for dog_id in index.ids]
+    final = [c + b for c, b in zip(core, bonus)]
+    return ScoredFeed(keep=keep, base=base, pref=pref_total, core=core, bonus=bonus, final=final)
+
+
+def get_scorer(backend: str = DEFAULT_SCORING_BACKEND) -> Callable[..., ScoredFeed]:
+    """Return the score_index implementation for ``backend`` (see SCORING_BACKENDS)."""
+    if backend not in SCORING_BACKENDS:
+        raise ValueError(f"Unknown scoring backend: {backend}")
+    if backend == "python":
+        return score_index
+    from . import vectorized  # deferred: vectorized imports this module
+
+    if backend == "numpy" or vectorized.available():
+        return vectorized.score_index_numpy
+    return score_index
+
+
+def select_top(
+    index: DogIndex,
+    feed: ScoredFeed,
+    candidates: Iterable[int],
+    k: int,
+    source_cap: Optional[int] = DEFAULT_SOURCE_CAP,
+) -> List[int]:
+    """Positions of the k best-scoring candidates, at most ``source_cap`` per source.
+
+    Equivalent to a stable descending sort followed by apply_source_cap, but each
+    source only keeps a bounded heap of its best ``min(cap, k)`` dogs, so the cost
+    is O(n log k) rather than a full sort of the feed.
+    """
+    if k <= 0:
+        return []
+    final = feed.final
+
+    def rank_key(i: int) -> Tuple[float, int]:
+        return (-final[i], i)
+
+    if source_cap is None or source_cap <= 0:
+        return heapq.nsmallest(k, candidates, key=rank_key)
+    by_source: Dict[int, List[int]] = {}
+    source_codes = index.source.codes
+    for i in candidates:
+        by_source.setdefault(source_codes[i], []).append(i)
+    per_source = min(source_cap, k)
+    shortlist: List[int] = []
+    for positions in by_source.values():
+        shortlist.extend(heapq.nsmallest(per_source, positions, key=rank_key))
+    return heapq.nsmallest(k, shortlist, key=rank_key)
+
+
 def rank_dogs(
-    dogs: List[Dict[str, Any]],
+    dogs: List[Dict[str, Any]] | DogIndex,
     preferences: Iterable[Preference],
     desired: Optional[Dict[str, Any]] = None,
-    views: Optional[Dict[str, int]] = None,
+    views: Optional[Mapping[str, int]] = None,
     top_n: int = DEFAULT_TOP_N,
     source_cap: Optional[int] = DEFAULT_SOURCE_CAP,
     exploration_slots: int = DEFAULT_EXPLORE_SLOTS,
@@ -282,82 +689,242 @@ def rank_dogs(
     min_core_score: float = DEFAULT_MIN_CORE,
     min_completeness: float = 0.0,
     tag_explore_reason: bool = True,
+    backend: str = DEFAULT_SCORING_BACKEND,
+    exclude_ids: Optional[Collection[str]] = None,
 ) -> List[Dict[str, Any]]:
+    """Rank the feed into best + explore sections.
+
+    ``exclude_ids`` (e.g. dogs the user has already seen) are removed before
+    selection, so the page is still filled from the remaining dogs.
+    """
+    index = dogs if isinstance(dogs, DogIndex) else DogIndex(dogs)
+    pref_list = list(preferences)
+    feed = get_scorer(backend)(index, pref_list, desired, views=views, exploration_k=exploration_k)
+    return select_ranked(
+        index,
+        feed,
+        pref_list,
+        desired=desired,
+        views=views,
+        top_n=top_n,
+        source_cap=source_cap,
+        exploration_slots=exploration_slots,
+        min_core_score=min_core_score,
+        min_completeness=min_completeness,
+        tag_explore_reason=tag_explore_reason,
+        exclude_ids=exclude_ids,
+    )
+
+
+def select_slots(
+    index: DogIndex,
+    feed: ScoredFeed,
+    desired: Optional[Dict[str, Any]] = None,
+    views: Optional[Mapping[str, int]] = None,
+    top_n: int = DEFAULT_TOP_N,
+    source_cap: Optional[int] = DEFAULT_SOURCE_CAP,
+    exploration_slots: int = DEFAULT_EXPLORE_SLOTS,
+    min_core_score: float = DEFAULT_MIN_CORE,
+    min_completeness: float = 0.0,
+    exclude_ids: Optional[Collection[str]] = None,
+) -> List[RankedSlot]:
+    """Pick one page of positions and their scores, without touching dog payloads.
+
+    Slots are small and picklable, so ranking workers can return them to a
+    process that holds the same feed and materializes the items.
+    """
     desired = desired or {}
     views = views or {}
-    scored: List[Dict[str, Any]] = []
-    for dog in dogs:
-        res = score_dog(dog, desired, preferences, views=views, exploration_k=exploration_k)
-        if res:
-            scored.append(res)
-    scored.sort(key=lambda x: x["final_score"], reverse=True)
-    capped = apply_source_cap(scored, source_cap)
+    ids = index.ids
+    completeness = index.completeness
+    special_needs = index.special_needs
+    source_codes = index.source.codes
+    sources = index.source.values
+    # Positions stay in feed order; every selection key ends with the position so
+    # ties resolve exactly like the stable sorts this replaces.
+    if exclude_ids:
+        excluded = exclude_ids if isinstance(exclude_ids, (set, frozenset)) else set(exclude_ids)
+        candidates = [i for i, kept in enumerate(feed.keep) if kept and ids[i] not in excluded]
+    else:
+        candidates = [i for i, kept in enumerate(feed.keep) if kept]
+
+    def build_slots(positions: List[int], section: str) -> List[RankedSlot]:
+        return [
+            RankedSlot(
+                position=i,
+                section=section,
+                base_score=float(feed.base[i]),
+                pref_score=float(feed.pref[i]),
+                core_score=float(feed.core[i]),
+                exploration_bonus=float(feed.bonus[i]),
+                final_score=float(feed.final[i]),
+            )
+            for i in positions
+        ]
+
     if exploration_slots <= 0 or top_n <= 0:
-        return capped[:top_n]
+        return build_slots(select_top(index, feed, candidates, top_n, source_cap), "best")
 
     best_count = max(0, top_n - exploration_slots)
-    best = capped[:best_count]
+    best_positions = select_top(index, feed, candidates, best_count, source_cap)
     # Track how many dogs from each source are already in the best list so that
     # Explore can preferentially surface under-represented sources when possible.
     source_counts_best: Dict[str, int] = {}
-    for item in best:
-        source = item["dog"].get("source_id") or "unknown"
+    for i in best_positions:
+        source = sources[source_codes[i]]
         source_counts_best[source] = source_counts_best.get(source, 0) + 1
 
-    used_ids = {item["dog"]["id"] for item in best}
-    remainder = [item for item in scored if item["dog"]["id"] not in used_ids]
-    explore_pool = [
-        item for item in remainder
-        if item["core_score"] >= min_core_score and item["completeness"] >= min_completeness
-    ]
-    explore_pool.sort(
-        key=lambda x: (
-            views.get(x["dog"]["id"], 0),  # low views first
-            source_counts_best.get(x["dog"].get("source_id") or "unknown", 0),  # sources with fewer best hits first
-            x["completeness"],            # low completeness first
-            x["dog"].get("special_needs") is True,  # special care later unless requested explicitly
-            -x["final_score"],            # then stronger overall (with bonus)
-        )
+    used_ids = {ids[i] for i in best_positions}
+    remainder = [i for i in candidates if ids[i] not in used_ids]
+    explore_pool = (
+        i for i in remainder
+        if feed.core[i] >= min_core_score and completeness[i] >= min_completeness
     )
-    explore = explore_pool[:exploration_slots]
-    used_ids.update(item["dog"]["id"] for item in explore)
-
-    if len(explore) < exploration_slots:
-        fallback_candidates = [item for item in remainder if item["dog"]["id"] not in used_ids]
-
-        def fallback_key(item: Dict[str, Any]) -> Tuple[float, ...]:
-            dog = item["dog"]
-            loc_score = location_match_score(dog, desired)
-            size_score_raw = closeness(dog.get("size"), desired.get("size"), SIZE_ORDER)
-            size_score = 0.0 if size_score_raw is None else size_score_raw
-            age_score_raw = closeness(dog.get("age_group"), desired.get("age_group"), AGE_ORDER)
-            age_score = 0.0 if age_score_raw is None else age_score_raw
-            sex_score = 0.0
-            if desired.get("sex"):
-                sex_score = 1.0 if str(dog.get("sex") or "").lower() == str(desired.get("sex")).lower() else 0.0
+    explore_positions = heapq.nsmallest(
+        exploration_slots,
+        explore_pool,
+        key=lambda i: (
+            views.get(ids[i], 0),  # low views first
+            source_counts_best.get(sources[source_codes[i]], 0),  # sources with fewer best hits first
+            completeness[i],       # low completeness first
+            special_needs[i] == 1,  # special care later unless requested explicitly
+            -feed.final[i],        # then stronger overall (with bonus)
+            i,
+        ),
+    )
+    used_ids.update(ids[i] for i in explore_positions)
+
+    if len(explore_positions) < exploration_slots:
+        fallback_candidates = (i for i in remainder if ids[i] not in used_ids)
+        loc_pref = desired.get("location_label")
+        wants = (loc_pref or "").lower()
+        wants_state = (desired.get("location_state") or "").lower()
+        label_hits = [label == wants for label in index.location_label.values]
+        state_hits = [bool(wants_state) and state == wants_state for state in index.location_state.values]
+        size_column = index.column("size")
+        size_scores = [closeness(value, desired.get("size"), SIZE_ORDER) or 0.0 for value in size_column.values]
+        age_column = index.column("age_group")
+        age_scores = [closeness(value, desired.get("age_group"), AGE_ORDER) or 0.0 for value in age_column.values]
+        wants_sex = str(desired.get("sex")).lower() if desired.get("sex") else None
+        sex_scores = [1.0 if wants_sex is not None and sex == wants_sex else 0.0 for sex in index.sex.values]
+
+        def fallback_key(i: int) -> Tuple[float, ...]:
+            loc_score = 0.0
+            if loc_pref:
+                loc_score = (
+                    1.0 if label_hits[index.location_label.codes[i]]
+                    else 0.7 if state_hits[index.location_state.codes[i]]
+                    else 0.4
+                )
             return (
                 -loc_score,
-                -size_score,
-                -age_score,
-                -sex_score,
-                dog.get("special_needs") is True,
-                views.get(dog["id"], 0),
-                item["completeness"],
-                -item["final_score"],
+                -size_scores[size_column.codes[i]],
+                -age_scores[age_column.codes[i]],
+                -sex_scores[index.sex.codes[i]],
+                special_needs[i] == 1,
+                views.get(ids[i], 0),
+                completeness[i],
+                -feed.final[i],
+                i,
             )
 
-        fallback_candidates.sort(key=fallback_key)
-        needed = exploration_slots - len(explore)
-        explore.extend(fallback_candidates[:needed])
-
-    if tag_explore_reason:
-        for item in explore:
-            item["reasons"].append({"field": "explore_slot", "effect": "explore", "message": "Shown in Explore to surface lower-info dogs"})
-    combined = best + explore
-    # Mark section
-    for item in combined:
-        item["section"] = "best" if item in best else "explore"
-    return combined[:top_n]
+        needed = exploration_slots - len(explore_positions)
+        explore_positions.extend(heapq.nsmallest(needed, fallback_candidates, key=fallback_key))
+
+    return (build_slots(best_positions, "best") + build_slots(explore_positions, "explore"))[:top_n]
+
+
+def materialize_slots(
+    index: DogIndex,
+    slots: Iterable[RankedSlot],
+    preferences: Iterable[Preference],
+    desired: Optional[Dict[str, Any]] = None,
+    tag_explore_reason: bool = True,
+) -> List[Dict[str, Any]]:
+    """Turn selected slots into rank_dogs items; reasons are explained only for these dogs."""
+    desired = desired or {}
+    pref_list = list(preferences)
+    items: List[Dict[str, Any]] = []
+    for slot in slots:
+        dog = index.dogs[slot.position]
+        reasons = explain_dog(dog, desired, pref_list)
+        if tag_explore_reason and slot.section == "explore":
+            reasons.append({"field": "explore_slot", "effect": "explore", "message": "Shown in Explore to surface lower-info dogs"})
+        items.append(
+            {
+                "dog": dog,
+                "position": slot.position,
+                "base_score": slot.base_score,
+                "pref_score": slot.pref_score,
+                "core_score": slot.core_score,
+                "exploration_bonus": slot.exploration_bonus,
+                "final_score": slot.final_score,
+                "reasons": reasons,
+                "completeness": index.completeness[slot.position],
+                "section": slot.section,
+            }
+        )
+    return items
+
+
+def select_ranked(
+    index: DogIndex,
+    feed: ScoredFeed,
+    preferences: Iterable[Preference],
+    desired: Optional[Dict[str, Any]] = None,
+    views: Optional[Mapping[str, int]] = None,
+    top_n: int = DEFAULT_TOP_N,
+    source_cap: Optional[int] = DEFAULT_SOURCE_CAP,
+    exploration_slots: int = DEFAULT_EXPLORE_SLOTS,
+    min_core_score: float = DEFAULT_MIN_CORE,
+    min_completeness: float = 0.0,
+    tag_explore_reason: bool = True,
+    exclude_ids: Optional[Collection[str]] = None,
+) -> List[Dict[str, Any]]:
+    """Selection half of rank_dogs, for callers that already hold a ScoredFeed
+    (e.g. a cached scoring pass shared by requests with the same filters)."""
+    slots = select_slots(
+        index,
+        feed,
+        desired=desired,
+        views=views,
+        top_n=top_n,
+        source_cap=source_cap,
+        exploration_slots=exploration_slots,
+        min_core_score=min_core_score,
+        min_completeness=min_completeness,
+        exclude_ids=exclude_ids,
+    )
+    return materialize_slots(index, slots, preferences, desired=desired, tag_explore_reason=tag_explore_reason)
+
+
+# Page tokens come from clients: bound both the token and what it may inflate to
+# (about 200k ids of 20 bytes) so a small token cannot expand into a huge payload.
+MAX_PAGE_TOKEN_LENGTH = 1 << 20
+MAX_PAGE_TOKEN_BYTES = 1 << 22
+
+
+def encode_page_token(dog_ids: Iterable[str]) -> str:
+    """Opaque "show me more" token carrying the ids already served in a session."""
+    payload = "\n".join(sorted(set(dog_ids))).encode("utf-8")
+    return base64.urlsafe_b64encode(zlib.compress(payload)).decode("ascii")
+
+
+def decode_page_token(token: Optional[str]) -> Set[str]:
+    """Inverse of encode_page_token; raises ValueError for a malformed or oversized token."""
+    if not token:
+        return set()
+    if len(token) > MAX_PAGE_TOKEN_LENGTH:
+        raise ValueError("Invalid page token")
+    try:
+        decompressor = zlib.decompressobj()
+        payload = decompressor.decompress(base64.urlsafe_b64decode(token.encode("ascii")), MAX_PAGE_TOKEN_BYTES)
+        if decompressor.unconsumed_tail or not decompressor.eof:
+            raise ValueError("page token too large or truncated")
+        text = payload.decode("utf-8")
+    except (ValueError, zlib.error) as exc:
+        raise ValueError("Invalid page token") from exc
+    return set(text.split("\n")) if text else set()
 
 
 def parse_preferences(raw: str) -> List[Preference]:
@@ -0,0 +1,60 @@
+"""Field projections of normalized dogs for API responses."""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable
+
+# Everything the chat UI renders on a card or in the detail modal. The cleaned
+# ``description`` stands in for ``description_html`` (the UI strips tags anyway),
+# and the upstream ``raw`` payload is never part of a card.
+CARD_FIELDS = [
+    "id",
+    "source_id",
+    "name",
+    "sex",
+    "size",
+    "weight_lbs",
+    "age_years",
+    "age_months",
+    "age_text",
+    "age_group",
+    "breed_text",
+    "breed_primary",
+    "breed_secondary",
+    "energy_level",
+    "description",
+    "good_with_kids",
+    "good_with_dogs",
+    "good_with_cats",
+    "house_trained",
+    "hypoallergenic",
+    "special_needs",
+    "needs_foster",
+    "tags",
+    "primary_photo_url",
+    "photo_urls",
+    "detail_url",
+    "public_url",
+    "adopt_url",
+    "location_label",
+    "status",
+]
+
+# Source payloads kept only for debugging; excluded from detail views unless asked for.
+DETAIL_EXCLUDED_FIELDS = {"raw"}
+
+
+def project_fields(dog: Dict[str, Any], fields: Iterable[str]) -> Dict[str, Any]:
+    projected = {"id": dog.get("id")}
+    for field in fields:
+        projected[field] = dog.get(field)
+    return projected
+
+
+def project_card(dog: Dict[str, Any]) -> Dict[str, Any]:
+    return project_fields(dog, CARD_FIELDS)
+
+
+def project_detail(dog: Dict[str, Any], include_raw: bool = False) -> Dict[str, Any]:
+    if include_raw:
+        return dict(dog)
+    return {key: value for key, value in dog.items() if key not in DETAIL_EXCLUDED_FIELDS}
@@ -0,0 +1,86 @@
+"""Sidecar store for upstream ``raw`` payloads, kept out of the normalized feed.
+
+``dogs.raw.bin`` is ``MAGIC``, a uint32 header length, a JSON header mapping each
+dog id to ``[offset, length]`` and a blob of compact JSON payloads. Readers
+memory-map it and decode a single payload on demand.
+"""
+from __future__ import annotations
+
+import json
+import mmap
+import shutil
+import struct
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .match import DEFAULT_FEED_PATH
+
+MAGIC = b"ZSTRAW01"
+FORMAT_VERSION = 1
+DEFAULT_RAW_STORE_PATH = DEFAULT_FEED_PATH.with_suffix(".raw.bin")
+_HEADER_LENGTH = struct.Struct("<I")
+
+
+class RawStore:
+    """Read-only, memory-mapped lookup of raw payloads by dog id."""
+
+    def __init__(self, path: Path = DEFAULT_RAW_STORE_PATH) -> None:
+        with path.open("rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a raw payload store")
+        (header_length,) = _HEADER_LENGTH.unpack_from(self._map, len(MAGIC))
+        start = len(MAGIC) + _HEADER_LENGTH.size
+        header = json.loads(self._map[start:start + header_length])
+        if header.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported raw store version: {header.get('version')}")
+        self._data_offset = start + header_length
+        self._index: Dict[str, List[int]] = header["index"]
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, dog_id: object) -> bool:
+        return dog_id in self._index
+
+    def get(self, dog_id: str) -> Optional[Any]:
+        entry = self._index.get(dog_id)
+        if entry is None:
+            return None
+        offset, length = entry
+        start = self._data_offset + offset
+        return json.loads(self._map[start:start + length])
+
+
+class RawStoreWriter:
+    """Build a raw store incrementally; payloads are spooled to disk until ``close``."""
+
+    def __init__(self, output: Path) -> None:
+        self.output = output
+        output.parent.mkdir(parents=True, exist_ok=True)
+        # The header (with every offset) precedes the payloads, so they wait in a spool file.
+        self._spool = tempfile.TemporaryFile(dir=output.parent)
+        self._index: Dict[str, List[int]] = {}
+        self._offset = 0
+
+    def add(self, dog_id: str, raw: Any) -> None:
+        # The first payload wins for repeated ids, matching DogIndex.positions.
+        if dog_id in self._index:
+            return
+        chunk = json.dumps(raw, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self._index[dog_id] = [self._offset, len(chunk)]
+        self._spool.write(chunk)
+        self._offset += len(chunk)
+
+    def close(self) -> None:
+        header = json.dumps({"version": FORMAT_VERSION, "index": self._index}, separators=(",", ":")).encode("utf-8")
+        temp_path = self.output.with_suffix(self.output.suffix + ".tmp")
+        with self._spool, temp_path.open("wb") as f:
+            f.write(MAGIC)
+            f.write(_HEADER_LENGTH.pack(len(header)))
+            f.write(header)
+            self._spool.seek(0)
+            shutil.copyfileobj(self._spool, f)
+        temp_path.replace(self.output)
+
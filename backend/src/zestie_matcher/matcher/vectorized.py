@@ -0,0 +1,120 @@
+"""Optional NumPy scoring backend for DogIndex.
+
+Mirrors ``match.score_index`` with array operations over the whole feed. The
+pure-Python path stays the reference: components are accumulated in the same
+order with the same float64 operations, so scores are bit-identical.
+"""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Optional
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+from .match import (
+    AGE_ORDER,
+    DEFAULT_EXPLORATION_K,
+    SIZE_ORDER,
+    Column,
+    DogIndex,
+    Preference,
+    ScoredFeed,
+    ViewSnapshot,
+    closeness,
+    opted_in_special_needs,
+    preference_contribution,
+)
+
+
+def available() -> bool:
+    return np is not None
+
+
+def _gather(column: Column, table: Iterable[Any], dtype: Any) -> "np.ndarray":
+    codes = np.frombuffer(column.codes, dtype=np.intc)
+    return np.fromiter(table, dtype=dtype, count=len(column.values))[codes]
+
+
+def score_index_numpy(
+    index: DogIndex,
+    preferences: Iterable[Preference],
+    desired: Optional[Dict[str, Any]] = None,
+    views: Optional[Mapping[str, int]] = None,
+    exploration_k: float = DEFAULT_EXPLORATION_K,
+) -> ScoredFeed:
+    if np is None:
+        raise RuntimeError("numpy is not installed; use the python scoring backend")
+    desired = desired or {}
+    views = views or {}
+    pref_list = list(preferences)
+    n = len(index)
+
+    keep = np.ones(n, dtype=bool)
+    pref_total = np.zeros(n, dtype=np.float64)
+    active_weights = 0.0
+    for pref in pref_list:
+        column = index.column(pref.field)
+        outcomes = [preference_contribution(pref, {pref.field: value}) for value in column.values]
+        keep &= ~_gather(column, (drop for _, drop, _ in outcomes), bool)
+        pref_total += _gather(column, (contribution for contribution, _, _ in outcomes), np.float64)
+        active_weights += abs(pref.weight)
+    if active_weights > 0:
+        pref_total /= active_weights
+
+    totals = np.frombuffer(index.status, dtype=np.float64).copy()
+    counts = np.ones(n, dtype=np.int64)
+    if not opted_in_special_needs(pref_list):
+        special = np.frombuffer(index.special_needs, dtype=np.int8).astype(bool)
+        totals[special] += 0.6
+        counts += special
+    loc_pref = desired.get("location_label")
+    if loc_pref:
+        wants = loc_pref.lower()
+        wants_state = (desired.get("location_state") or "").lower()
+        label_hits = _gather(index.location_label, (label == wants for label in index.location_label.values), bool)
+        state_hits = _gather(
+            index.location_state,
+            (bool(wants_state) and state == wants_state for state in index.location_state.values),
+            bool,
+        )
+        totals += np.where(label_hits, 1.0, np.where(state_hits, 0.7, 0.4))
+        counts += 1
+    for field, order in (("size", SIZE_ORDER), ("age_group", AGE_ORDER)):
+        target = desired.get(field)
+        if not target:
+            continue
+        column = index.column(field)
+        components = _gather(
+            column,
+            (np.nan if c is None else c for c in (closeness(value, target, order) for value in column.values)),
+            np.float64,
+        )
+        present = ~np.isnan(components)
+        totals[present] += components[present]
+        counts += present
+    base = totals / counts
+
+    core = base + pref_total
+    if isinstance(views, ViewSnapshot):
+        seen = np.frombuffer(views.aligned(index), dtype=np.int64, count=n)
+    else:
+        # Scatter the (usually much smaller) views map instead of probing it once per dog.
+        seen = np.zeros(n, dtype=np.int64)
+        for dog_id, count in views.items():
+            for position in index.locate(dog_id):
+                seen[position] = count
+    bonus = exploration_k / np.sqrt(1 + seen)
+    final = core + bonus
+    # Selection walks keep/core/final for every dog, so hand those back as plain lists;
+    # the rest are only read for the handful of dogs that make the page.
+    return ScoredFeed(
+        keep=keep.tolist(),
+        base=base,
+        pref=pref_total,
+        core=core.tolist(),
+        bonus=bonus,
+        final=final.tolist(),
+    )
@@ -0,0 +1,387 @@
+#!/usr/bin/env python3
+"""Cross-source duplicate detection for the normalized feed.
+
+The same dog is often listed by its shelter (NYCACC, Muddy Paws, ...) and again
+by an aggregator (Wagtopia) under another id. ``DedupIndex`` finds those
+listings without comparing every pair: each dog is filed under a few blocking
+keys (a photo URL, a few min-hashes of its description, its name and sex with a
+weight bucket), and only dogs from different sources that share a key are
+scored. Weight buckets overlap, so two weights within tolerance always share
+one. Matches are merged with union-find; the shelter's own listing is kept and
+the others are attached to it as ``also_listed_at`` links.
+
+Benchmark on a synthetic feed built from the real one:
+
+    PYTHONPATH=backend/src python -m zestie_matcher.normalization.dedup --dogs 100000
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import heapq
+import math
+import random
+import re
+import time
+import zlib
+from collections import defaultdict
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
+
+ALSO_LISTED_AT = "also_listed_at"
+# Listings re-published from other organizations; the original listing wins.
+AGGREGATOR_SOURCES = frozenset({"wagtopia"})
+# Blocks larger than this are too ambiguous to resolve (placeholder photos,
+# boilerplate text, very common names in one weight range) and are skipped.
+MAX_BLOCK_SIZE = 40
+# A photo filed under more distinct names than this is a placeholder or logo, not one
+# dog's picture.
+MAX_PHOTO_NAMES = 1
+# Two weights match within 12% (at least 2 lbs); buckets are 25% wide.
+WEIGHT_TOLERANCE = 0.12
+WEIGHT_TOLERANCE_LBS = 2.0
+_WEIGHT_BUCKET = math.log(1.25)
+# Shelters estimate ages loosely: within 20% (at least a year) counts as the same.
+AGE_TOLERANCE = 0.2
+AGE_TOLERANCE_MONTHS = 12
+# Descriptions are compared as sets of word 3-grams (of their first 200 words),
+# sketched by the 32 smallest CRC32 hashes (a bottom-k min-hash, stable across
+# runs); the 4 smallest are also blocking keys. Re-posted bios score well above
+# 0.6, while different dogs' bios, even from one shelter, stay far below it.
+MAX_SKETCH_WORDS = 200
+SKETCH_SIZE = 32
+TEXT_KEYS = 4
+MIN_SHINGLES = 8
+TEXT_SIMILARITY = 0.6
+
+_NON_LETTERS = re.compile(r"[^a-z]+")
+_WORD = re.compile(r"[a-z0-9']+")
+_GENERIC_BREED_WORDS = frozenset(
+    {"", "mix", "mixed", "breed", "unknown", "all", "types", "type", "dog", "small", "medium", "large", "extra", "and"}
+)
+
+
+def _name_key(name: Optional[str]) -> str:
+    return _NON_LETTERS.sub("", (name or "").lower())
+
+
+def _breed_words(breed_text: Optional[str]) -> FrozenSet[str]:
+    words = (word.rstrip("s") for word in _NON_LETTERS.split((breed_text or "").lower()))
+    return frozenset(word for word in words if word not in _GENERIC_BREED_WORDS)
+
+
+def _photo_key(url: str) -> str:
+    return hashlib.sha1(url.split("?", 1)[0].strip().lower().encode("utf-8")).hexdigest()[:16]
+
+
+def _text_sketch(text: Optional[str]) -> Tuple[int, ...]:
+    """Sorted smallest hashes of the description's word shingles (empty when too short)."""
+    words = _WORD.findall((text or "").lower())[:MAX_SKETCH_WORDS]
+    shingles = {zlib.crc32(" ".join(shingle).encode("utf-8")) for shingle in zip(words, words[1:], words[2:])}
+    if len(shingles) < MIN_SHINGLES:
+        return ()
+    return tuple(heapq.nsmallest(SKETCH_SIZE, shingles))
+
+
+def _text_similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of two descriptions from their sketches."""
+    shared = set(a).intersection(b)
+    if not shared:
+        return 0.0
+    union = heapq.nsmallest(SKETCH_SIZE, set(a).union(b))
+    return sum(1 for value in union if value in shared) / len(union)
+
+
+def _age_months(dog: Dict[str, Any]) -> Optional[float]:
+    if dog.get("age_months") is not None:
+        return float(dog["age_months"])
+    if dog.get("age_years") is not None:
+        return float(dog["age_years"]) * 12
+    return None
+
+
+def _close(a: float, b: float, relative: float, absolute: float) -> bool:
+    return abs(a - b) <= max(absolute, relative * max(a, b))
+
+
+@dataclass(frozen=True)
+class _Listing:
+    """The fields duplicate detection needs, kept instead of the whole dog."""
+
+    position: int
+    id: str
+    source_id: str
+    url: Optional[str]
+    name: str
+    sex: str
+    weight: Optional[float]
+    age: Optional[float]
+    breed: FrozenSet[str]
+    state: str
+    photos: FrozenSet[str]
+    text: Tuple[int, ...]
+
+
+def _listing(position: int, dog: Dict[str, Any]) -> _Listing:
+    weight = dog.get("weight_lbs")
+    return _Listing(
+        position=position,
+        id=dog["id"],
+        source_id=dog.get("source_id") or "unknown",
+        url=dog.get("public_url") or dog.get("detail_url"),
+        name=_name_key(dog.get("name")),
+        sex=str(dog.get("sex") or "")[:1].lower(),
+        weight=float(weight) if weight else None,
+        age=_age_months(dog),
+        breed=_breed_words(dog.get("breed_text") or dog.get("breed_primary")),
+        state=(dog.get("location_state") or "").lower(),
+        photos=frozenset(_photo_key(url) for url in dog.get("photo_urls") or [] if url),
+        text=_text_sketch(dog.get("description")),
+    )
+
+
+def _blocking_keys(listing: _Listing) -> Iterator[Tuple[Any, ...]]:
+    for photo in listing.photos:
+        yield ("photo", photo)
+    for value in listing.text[:TEXT_KEYS]:
+        yield ("text", value)
+    if not listing.name or listing.weight is None:
+        return
+    # Re-listings usually keep the name and roughly the weight. Each weight is
+    # filed under its bucket and the next one up, so weights in adjacent buckets
+    # (less than one bucket apart) still meet in a block.
+    bucket = math.floor(math.log(listing.weight) / _WEIGHT_BUCKET)
+    yield ("name", listing.name, listing.sex, bucket)
+    yield ("name", listing.name, listing.sex, bucket + 1)
+
+
+def is_same_dog(a: _Listing, b: _Listing) -> bool:
+    """Whether two listings from different sources describe one dog.
+
+    Nothing may contradict: known names, sexes, weights, ages or states that
+    disagree, or specific breeds with no word in common. Then a shared photo
+    counts when the names are known and equal (a placeholder or shelter logo
+    can slip under the block size cap, so a photo alone never merges). Otherwise
+    either the description was re-posted or the name matches with weight, age
+    and breed all known and agreeing. A name with one or two agreeing fields is
+    not enough: common names collide too often at scale. Litters often share
+    one bio, so a re-posted description alone does not outweigh different names.
+    """
+    if a.name and b.name and a.name != b.name:
+        return False
+    if (a.sex and b.sex and a.sex != b.sex) or (a.state and b.state and a.state != b.state):
+        return False
+    agreeing = 0
+    if a.weight is not None and b.weight is not None:
+        if not _close(a.weight, b.weight, WEIGHT_TOLERANCE, WEIGHT_TOLERANCE_LBS):
+            return False
+        agreeing += 1
+    if a.age is not None and b.age is not None:
+        if not _close(a.age, b.age, AGE_TOLERANCE, AGE_TOLERANCE_MONTHS):
+            return False
+        agreeing += 1
+    if a.breed and b.breed:
+        if not a.breed & b.breed:
+            return False
+        agreeing += 1
+    if agreeing == 3 and a.name:
+        return True
+    if a.photos & b.photos and a.name and a.name == b.name:
+        return True
+    return _text_similarity(a.text, b.text) >= TEXT_SIMILARITY
+
+
+@dataclass
+class Duplicates:
+    """Resolved clusters: which positions to drop and the links to add to the kept dog."""
+
+    dropped: Set[int] = field(default_factory=set)
+    links: Dict[int, List[Dict[str, Any]]] = field(default_factory=dict)
+
+    def apply(self, dogs: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """Yield the feed (in its original order) without duplicates, links attached."""
+        for position, dog in enumerate(dogs):
+            if position in self.dropped:
+                continue
+            links = self.links.get(position)
+            if links:
+                dog[ALSO_LISTED_AT] = links
+            yield dog
+
+
+class DedupIndex:
+    """Collects dogs in feed order and finds cross-source duplicates among them."""
+
+    def __init__(self, max_block_size: int = MAX_BLOCK_SIZE) -> None:
+        self._max_block_size = max_block_size
+        self._listings: List[_Listing] = []
+        self._blocks: Dict[Tuple[Any, ...], List[int]] = defaultdict(list)
+        self.comparisons = 0
+
+    def __len__(self) -> int:
+        return len(self._listings)
+
+    def add(self, dog: Dict[str, Any]) -> None:
+        listing = _listing(len(self._listings), dog)
+        self._listings.append(listing)
+        for key in _blocking_keys(listing):
+            self._blocks[key].append(listing.position)
+
+    def _drop_placeholder_photos(self) -> Set[Tuple[Any, ...]]:
+        """Forget photos that cannot be one dog's picture, so they are neither a
+        block nor evidence when the listings meet through another key."""
+        placeholders: Set[Tuple[Any, ...]] = set()
+        for key, members in self._blocks.items():
+            if key[0] != "photo" or len(members) < 2:
+                continue
+            names = {self._listings[position].name for position in members} - {""}
+            if len(members) > self._max_block_size or len(names) > MAX_PHOTO_NAMES:
+                placeholders.add(key)
+                for position in members:
+                    listing = self._listings[position]
+                    self._listings[position] = replace(listing, photos=listing.photos - {key[1]})
+        return placeholders
+
+    def _candidate_pairs(self) -> Iterator[Tuple[int, int]]:
+        seen: Set[Tuple[int, int]] = set()
+        placeholders = self._drop_placeholder_photos()
+        for key, members in self._blocks.items():
+            if len(members) < 2 or len(members) > self._max_block_size or key in placeholders:
+                continue
+            for i, first in enumerate(members):
+                source = self._listings[first].source_id
+                for second in members[i + 1:]:
+                    if self._listings[second].source_id == source or (first, second) in seen:
+                        continue
+                    seen.add((first, second))
+                    yield first, second
+
+    def resolve(self) -> Duplicates:
+        parent = list(range(len(self._listings)))
+        # Sources in each cluster (by root): a cluster holds at most one listing
+        # per source, so matches never chain two of one shelter's dogs together.
+        sources: Dict[int, Set[str]] = {}
+
+        def find(position: int) -> int:
+            while parent[position] != position:
+                parent[position] = parent[parent[position]]
+                position = parent[position]
+            return position
+
+        for first, second in self._candidate_pairs():
+            self.comparisons += 1
+            if is_same_dog(self._listings[first], self._listings[second]):
+                first_root, second_root = find(first), find(second)
+                if first_root == second_root:
+                    continue
+                first_sources = sources.get(first_root) or {self._listings[first_root].source_id}
+                second_sources = sources.get(second_root) or {self._listings[second_root].source_id}
+                if first_sources & second_sources:
+                    continue
+                parent[first_root] = second_root
+                sources[second_root] = first_sources | second_sources
+                sources.pop(first_root, None)
+
+        clusters: Dict[int, List[_Listing]] = defaultdict(list)
+        for listing in self._listings:
+            clusters[find(listing.position)].append(listing)
+        duplicates = Duplicates()
+        for members in clusters.values():
+            if len(members) < 2:
+                continue
+            keep = min(members, key=lambda listing: (listing.source_id in AGGREGATOR_SOURCES, listing.position))
+            duplicates.links[keep.position] = [
+                {"id": listing.id, "source_id": listing.source_id, "url": listing.url}
+                for listing in members
+                if listing is not keep
+            ]
+            duplicates.dropped.update(listing.position for listing in members if listing is not keep)
+        return duplicates
+
+
+def deduplicate(dogs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Drop cross-source duplicates from ``dogs``, linking them from the kept listing."""
+    index = DedupIndex()
+    for dog in dogs:
+        index.add(dog)
+    return list(index.resolve().apply(dogs))
+
+
+def _synthetic_feed(base: List[Dict[str, Any]], size: int, duplicate_rate: float, seed: int) -> Tuple[List[Dict[str, Any]], Set[Tuple[str, str]]]:
+    """``size`` dogs resampled from ``base`` with fresh ids, names, weights and
+    descriptions (sentences drawn from the real ones), plus aggregator re-listings
+    of shelter dogs; returns the feed and the planted pairs."""
+    rng = random.Random(seed)
+    names = [dog["name"] for dog in base if dog.get("name")]
+    sentences = [sentence for dog in base for sentence in re.split(r"(?<=[.!?])\s+", dog.get("description") or "") if len(sentence) > 30]
+    dogs: List[Dict[str, Any]] = []
+    planted: Set[Tuple[str, str]] = set()
+    while len(dogs) < size:
+        template = rng.choice(base)
+        dog = dict(template, id=f"{template.get('source_id')}:synthetic-{len(dogs)}", name=rng.choice(names))
+        dog["weight_lbs"] = round(rng.uniform(5, 110), 1) if rng.random() < 0.9 else None
+        dog["description"] = " ".join(rng.sample(sentences, rng.randint(4, 8))) if rng.random() < 0.9 else None
+        dog["photo_urls"] = [f"https://photos.example/{len(dogs)}.jpg"]
+        dogs.append(dog)
+        if dog.get("source_id") not in AGGREGATOR_SOURCES and rng.random() < duplicate_rate and len(dogs) < size:
+            relisted = dict(dog, id=f"wagtopia:synthetic-{len(dogs)}", source_id="wagtopia", age_years=None, age_months=None)
+            if dog["weight_lbs"] is not None:
+                relisted["weight_lbs"] = round(dog["weight_lbs"] * rng.uniform(0.95, 1.05), 1)
+            if dog["description"] and rng.random() < 0.5:
+                relisted["description"] = dog["description"] + " Contact the rescue to meet " + dog["name"] + "!"
+            relisted["photo_urls"] = [f"https://aggregator.example/{len(dogs)}.jpg"]
+            dogs.append(relisted)
+            planted.add((dog["id"], relisted["id"]))
+    return dogs, planted
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from zestie_matcher.matcher.match import DEFAULT_FEED_PATH, load_normalized_feed
+
+    parser = argparse.ArgumentParser(description="Benchmark cross-source duplicate detection on a synthetic feed")
+    parser.add_argument("--feed", type=Path, default=DEFAULT_FEED_PATH, help="Normalized feed to resample dogs from")
+    parser.add_argument("--dogs", type=int, nargs="+", default=[10000, 100000], help="Synthetic feed sizes")
+    parser.add_argument("--duplicate-rate", type=float, default=0.05, help="Share of shelter dogs re-listed by an aggregator")
+    parser.add_argument("--naive-sample", type=int, default=2000, help="Time all-pairs matching on this many dogs (0 to skip)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+
+    base = load_normalized_feed(args.feed)
+    for size in args.dogs:
+        dogs, planted = _synthetic_feed(base, size, args.duplicate_rate, args.seed)
+        started = time.perf_counter()
+        index = DedupIndex()
+        for dog in dogs:
+            index.add(dog)
+        indexed = time.perf_counter()
+        duplicates = index.resolve()
+        resolved = time.perf_counter()
+        kept_by_id = {dogs[position]["id"]: links for position, links in duplicates.links.items()}
+        found = sum(1 for shelter_id, relisted_id in planted if relisted_id in {link["id"] for link in kept_by_id.get(shelter_id, [])})
+        # A cluster of n listings drops n - 1; every drop beyond the planted pairs found is a false merge.
+        all_pairs = size * (size - 1) // 2
+        print(
+            f"{size:>7} dogs: index {1000 * (indexed - started):7.1f} ms, resolve {1000 * (resolved - indexed):7.1f} ms, "
+            f"{index.comparisons} comparisons ({index.comparisons / all_pairs:.2e} of all pairs), "
+            f"planted {found}/{len(planted)} found, {len(duplicates.dropped) - found} other merges"
+        )
+
+    if args.naive_sample:
+        sample, _ = _synthetic_feed(base, args.naive_sample, args.duplicate_rate, args.seed)
+        listings = [_listing(position, dog) for position, dog in enumerate(sample)]
+        started = time.perf_counter()
+        for i, first in enumerate(listings):
+            for j in range(i + 1, len(listings)):
+                second = listings[j]
+                if first.source_id != second.source_id:
+                    is_same_dog(first, second)
+        elapsed = time.perf_counter() - started
+        per_pair = elapsed / (len(sample) * (len(sample) - 1) / 2)
+        estimates = ", ".join(f"{size}: ~{per_pair * size * (size - 1) / 2:.0f} s" for size in args.dogs)
+        print(f"all-pairs on {len(sample)} dogs: {elapsed:.2f} s; extrapolated {estimates}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
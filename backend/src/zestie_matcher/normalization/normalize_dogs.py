@@ -7,10 +7,19 @@ import hashlib
 import html
 import json
 import re
+import tempfile
+from collections import deque
+from itertools import islice
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
+from zestie_matcher.matcher.binary_feed import write_binary_feed
+from zestie_matcher.matcher.feed_stream import FEED_FORMATS, FeedWriter, StreamedDocument, is_ndjson, iter_feed_dogs
+from zestie_matcher.matcher.raw_store import RawStoreWriter
+from zestie_matcher.normalization.dedup import ALSO_LISTED_AT, DedupIndex, Duplicates, deduplicate
 
 BASE_DIR = Path(__file__).resolve().parents[3]
 DEFAULT_ANIMAL_HAVEN = BASE_DIR / "data" / "raw" / "animal_haven" / "animalhaven.json"
@@ -20,6 +29,15 @@ DEFAULT_WAGTOPIA = BASE_DIR / "data" / "raw" / "wagtopia" / "wagtopia.json"
 DEFAULT_OUTPUT = BASE_DIR / "data" / "normalized" / "dogs.json"
 
 
+_NUMBER = re.compile(r"([0-9]+(?:\.[0-9]+)?)")
+_AGE_YEARS = re.compile(r"([0-9]+(?:\.[0-9]+)?)\s*(years?|yrs?|yr|yo|y/o)\b")
+_AGE_MONTHS = re.compile(r"([0-9]+(?:\.[0-9]+)?)\s*(months?|mos?|mo)\b")
+_AGE_WEEKS = re.compile(r"([0-9]+(?:\.[0-9]+)?)\s*(weeks?|wks?|wk)\b")
+_HTML_BREAK = re.compile(r"<br\s*/?>", re.IGNORECASE)
+_HTML_TAG = re.compile(r"<[^>]+>")
+_WHITESPACE = re.compile(r"\s+")
+
+
 def build_profile_id(source_id: str, source_animal_id: Optional[str], detail_url: Optional[str]) -> str:
     if source_animal_id:
         return f"{source_id}:{source_animal_id}"
@@ -36,21 +54,21 @@ def extract_age_from_text(age_text: Optional[str]) -> tuple[Optional[float], Opt
     months: Optional[int] = None
     weeks: Optional[int] = None
 
-    year_match = re.search(r"([0-9]+(?:\.[0-9]+)?)\s*(years?|yrs?|yr|yo|y/o)\b", text)
+    year_match = _AGE_YEARS.search(text)
     if year_match:
         value = float(year_match.group(1))
         if value <= 30:  # guard against dates like 2025
             years = value
 
     if months is None:
-        month_match = re.search(r"([0-9]+(?:\.[0-9]+)?)\s*(months?|mos?|mo)\b", text)
+        month_match = _AGE_MONTHS.search(text)
         if month_match:
             value = float(month_match.group(1))
             if value <= 240:  # <= 20 years
                 months = int(round(value))
 
     if weeks is None:
-        week_match = re.search(r"([0-9]+(?:\.[0-9]+)?)\s*(weeks?|wks?|wk)\b", text)
+        week_match = _AGE_WEEKS.search(text)
         if week_match:
             value = float(week_match.group(1))
             if value <= 520:  # <= 10 years in weeks
@@ -132,9 +150,9 @@ def clean_text(value: Optional[str]) -> Optional[str]:
         return None
     text = html.unescape(str(value))
     text = text.replace("\xa0", " ")
-    text = re.sub(r"<br\s*/?>", "\n", text, flags=re.IGNORECASE)
-    text = re.sub(r"<[^>]+>", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
+    text = _HTML_BREAK.sub("\n", text)
+    text = _HTML_TAG.sub(" ", text)
+    text = _WHITESPACE.sub(" ", text).strip()
     return text or None
 
 
@@ -143,7 +161,7 @@ def parse_weight_lbs(weight_text: Optional[str]) -> Optional[float]:
         return None
     if isinstance(weight_text, (int, float)):
         return float(weight_text)
-    match = re.search(r"([0-9]+(?:\.[0-9]+)?)", str(weight_text))
+    match = _NUMBER.search(str(weight_text))
     if not match:
         return None
     return float(match.group(1))
@@ -231,68 +249,55 @@ def normalize_compatibility(value: Any) -> Optional[bool]:
     return None
 
 
-def parse_energy_level(text: Optional[str]) -> Optional[int]:
-    if not text:
-        return None
-    lower = text.lower()
-    if "energy level" not in lower:
-        return None
-    segment = lower.split("energy level", 1)[1]
-    if ":" in segment:
-        segment = segment.split(":", 1)[1]
-        nums = re.findall(r"([0-9]{1,2})", segment)
-        for num in nums:
-            value = int(num)
-            if 0 < value <= 10:
-                return value
-    else:
-        nums = re.findall(r"([0-9]{1,2})", segment)
-        for num in reversed(nums):
-            value = int(num)
-            if 0 < value <= 10:
-                return value
-    return None
+_NOT_HOUSE_TRAINED = re.compile(r"not (yet )?(house[- ]?trained|house[- ]?broken|potty trained)")
+_WORKING_ON_HOUSE_TRAINING = re.compile(r"working on (house|potty)[- ]?training")
+_HOUSE_TRAINED = re.compile(r"(house|potty)[- ]?trained")
+_NOT_SPAYED_NEUTERED = re.compile(r"not (yet )?(spayed|neutered)")
+_ENERGY_DIGITS = re.compile(r"([0-9]{1,2})")
 
 
-def parse_house_trained(text: Optional[str]) -> Optional[bool]:
-    if not text:
+@dataclass(frozen=True)
+class DescriptionFacts:
+    """Fields derived from one description by ``analyze_description``."""
+
+    house_trained: Optional[bool] = None
+    crate_trained: Optional[bool] = None
+    spayed_neutered: Optional[bool] = None
+    vaccinations_up_to_date: Optional[bool] = None
+    foster_to_adopt: Optional[bool] = None
+    energy_level: Optional[int] = None
+
+
+# The helpers below take already-lowercased text. Each checks a plain substring
+# before running a pattern, so descriptions without the keyword cost one memchr-
+# speed scan rather than a regex pass.
+
+
+def _house_trained(lowered: str) -> Optional[bool]:
+    if "trained" not in lowered and "broken" not in lowered:
         return None
-    lowered = text.lower()
-    if re.search(r"not (yet )?(house[- ]?trained|house[- ]?broken|potty trained)", lowered):
+    if _NOT_HOUSE_TRAINED.search(lowered):
         return False
-    if re.search(r"working on (house|potty)[- ]?training", lowered):
+    if _WORKING_ON_HOUSE_TRAINING.search(lowered):
         return None
-    if re.search(r"(house|potty)[- ]?trained", lowered) or "housebroken" in lowered:
+    if _HOUSE_TRAINED.search(lowered) or "housebroken" in lowered:
         return True
     return None
 
 
-def parse_crate_trained(text: Optional[str]) -> Optional[bool]:
-    if not text:
+def _crate_trained(lowered: str) -> Optional[bool]:
+    if "crate trained" not in lowered:
         return None
-    lowered = text.lower()
-    if "not crate trained" in lowered:
-        return False
-    if "crate trained" in lowered:
-        return True
-    return None
+    return False if "not crate trained" in lowered else True
 
 
-def parse_spayed_neutered(text: Optional[str]) -> Optional[bool]:
-    if not text:
+def _spayed_neutered(lowered: str) -> Optional[bool]:
+    if "spayed" not in lowered and "neutered" not in lowered:
         return None
-    lowered = text.lower()
-    if re.search(r"not (yet )?(spayed|neutered)", lowered):
-        return False
-    if "spayed" in lowered or "neutered" in lowered:
-        return True
-    return None
+    return False if _NOT_SPAYED_NEUTERED.search(lowered) else True
 
 
-def parse_vaccinations_up_to_date(text: Optional[str]) -> Optional[bool]:
-    if not text:
-        return None
-    lowered = text.lower()
+def _vaccinations_up_to_date(lowered: str) -> Optional[bool]:
     if "up to date on" in lowered and "vacc" in lowered:
         return True
     if "utd on" in lowered and "vaccine" in lowered:
@@ -300,15 +305,68 @@ def parse_vaccinations_up_to_date(text: Optional[str]) -> Optional[bool]:
     return None
 
 
-def parse_foster_to_adopt(text: Optional[str]) -> Optional[bool]:
-    if not text:
-        return None
-    lowered = text.lower()
+def _foster_to_adopt(lowered: str) -> Optional[bool]:
     if "foster-to-adopt" in lowered or "foster to adopt" in lowered:
         return True
     return None
 
 
+def _energy_level(lowered: str) -> Optional[int]:
+    if "energy level" not in lowered:
+        return None
+    segment = lowered.split("energy level", 1)[1]
+    # "Energy level: 7/10" takes the first plausible number after the colon;
+    # otherwise the last one in the rest of the text wins.
+    if ":" in segment:
+        nums = _ENERGY_DIGITS.findall(segment.split(":", 1)[1])
+    else:
+        nums = list(reversed(_ENERGY_DIGITS.findall(segment)))
+    for num in nums:
+        value = int(num)
+        if 0 < value <= 10:
+            return value
+    return None
+
+
+def analyze_description(text: Optional[str]) -> DescriptionFacts:
+    """Lowercase ``text`` once and derive every description field from it."""
+    if not text:
+        return DescriptionFacts()
+    lowered = text.lower()
+    return DescriptionFacts(
+        house_trained=_house_trained(lowered),
+        crate_trained=_crate_trained(lowered),
+        spayed_neutered=_spayed_neutered(lowered),
+        vaccinations_up_to_date=_vaccinations_up_to_date(lowered),
+        foster_to_adopt=_foster_to_adopt(lowered),
+        energy_level=_energy_level(lowered),
+    )
+
+
+def parse_energy_level(text: Optional[str]) -> Optional[int]:
+    return _energy_level(text.lower()) if text else None
+
+
+def parse_house_trained(text: Optional[str]) -> Optional[bool]:
+    return _house_trained(text.lower()) if text else None
+
+
+def parse_crate_trained(text: Optional[str]) -> Optional[bool]:
+    return _crate_trained(text.lower()) if text else None
+
+
+def parse_spayed_neutered(text: Optional[str]) -> Optional[bool]:
+    return _spayed_neutered(text.lower()) if text else None
+
+
+def parse_vaccinations_up_to_date(text: Optional[str]) -> Optional[bool]:
+    return _vaccinations_up_to_date(text.lower()) if text else None
+
+
+def parse_foster_to_adopt(text: Optional[str]) -> Optional[bool]:
+    return _foster_to_adopt(text.lower()) if text else None
+
+
 def normalize_animal_haven(dog: Dict[str, Any], scraped_at: Optional[str]) -> Dict[str, Any]:
     source_id = "animal_haven"
     detail_url = dog.get("detail_url")
@@ -400,6 +458,7 @@ def normalize_muddy_paws(dog: Dict[str, Any], scraped_at: Optional[str]) -> Dict
     age_text = clean_text(age_text_raw) or age_text_raw
     description_text = dog.get("description")
     description_clean = clean_text(description_text)
+    facts = analyze_description(description_clean or description_text)
     age_years, age_months, age_text_display, age_group = resolve_age(age_text)
     solo_dog_only = bool(dog.get("solo_dog_only"))
     good_with_dogs = False if solo_dog_only else None
@@ -470,8 +529,8 @@ def normalize_muddy_paws(dog: Dict[str, Any], scraped_at: Optional[str]) -> Dict
         "special_needs": bool(dog.get("needs_special_care")),
         "special_needs_text": None,
         "medical_needs_text": None,
-        "vaccinations_up_to_date": parse_vaccinations_up_to_date(description_clean or description_text or ""),
-        "spayed_neutered": parse_spayed_neutered(description_clean or description_text or ""),
+        "vaccinations_up_to_date": facts.vaccinations_up_to_date,
+        "spayed_neutered": facts.spayed_neutered,
         "hypoallergenic": None,
         "needs_foster": None,
         "raw": dog,
@@ -490,6 +549,7 @@ def normalize_nycacc(pet: Dict[str, Any], scraped_at: Optional[str], feed_update
     description_html = pet.get("description_html") or pet.get("summaryHtml")
     description_raw = pet.get("description") or description_html
     description_clean = clean_text(description_raw)
+    facts = analyze_description(description_clean or description_raw)
     age_years, age_months, age_text_display, age_group = resolve_age(age_text)
     photos = pet.get("photos") or pet.get("photo_urls") or []
     desc = (description_clean or "").lower()
@@ -544,8 +604,8 @@ def normalize_nycacc(pet: Dict[str, Any], scraped_at: Optional[str], feed_update
         "special_needs": None,
         "special_needs_text": None,
         "medical_needs_text": None,
-        "vaccinations_up_to_date": parse_vaccinations_up_to_date(description_clean or description_raw or ""),
-        "spayed_neutered": parse_spayed_neutered(description_clean or description_raw or ""),
+        "vaccinations_up_to_date": facts.vaccinations_up_to_date,
+        "spayed_neutered": facts.spayed_neutered,
         "hypoallergenic": None,
         "needs_foster": None,
         "foster_to_adopt_candidate": parse_foster_to_adopt(pet.get("description") or ""),
@@ -568,16 +628,12 @@ def normalize_wagtopia(dog: Dict[str, Any], scraped_at: Optional[str]) -> Dict[s
     age_text = clean_text(age_text_raw) or age_text_raw
     description_text = dog.get("description") or ""
     description_clean = clean_text(description_text)
+    facts = analyze_description(description_clean or description_text)
     age_years, age_months, age_text_display, age_group = resolve_age(age_text)
     good_with_dogs = normalize_compatibility(dog.get("is_ok_with_other_dogs"))
     good_with_cats = normalize_compatibility(dog.get("is_ok_with_other_cats"))
     good_with_kids = normalize_compatibility(dog.get("is_ok_with_other_kids"))
     solo_dog_only = True if good_with_dogs is False else None
-    house_trained = parse_house_trained(description_clean or description_text)
-    crate_trained = parse_crate_trained(description_clean or description_text)
-    spayed_neutered = parse_spayed_neutered(description_clean or description_text)
-    vaccinations_up_to_date = parse_vaccinations_up_to_date(description_clean or description_text)
-    foster_to_adopt_candidate = parse_foster_to_adopt(description_clean or description_text)
     return {
         "id": build_profile_id(source_id, source_animal_id, detail_url),
         "source_id": source_id,
@@ -622,41 +678,212 @@ def normalize_wagtopia(dog: Dict[str, Any], scraped_at: Optional[str]) -> Dict[s
         "requires_fenced_yard": None,
         "solo_dog_only": solo_dog_only,
         "energy_level": parse_energy_level(description_text),
-        "house_trained": house_trained,
-        "crate_trained": crate_trained,
+        "house_trained": facts.house_trained,
+        "crate_trained": facts.crate_trained,
         "leash_trained": None,
         "special_needs": normalize_bool(dog.get("has_special_need")),
         "special_needs_text": None,
         "medical_needs_text": None,
-        "vaccinations_up_to_date": vaccinations_up_to_date,
-        "spayed_neutered": spayed_neutered,
+        "vaccinations_up_to_date": facts.vaccinations_up_to_date,
+        "spayed_neutered": facts.spayed_neutered,
         "hypoallergenic": None,
         "needs_foster": normalize_bool(dog.get("needs_foster")),
-        "foster_to_adopt_candidate": foster_to_adopt_candidate,
+        "foster_to_adopt_candidate": facts.foster_to_adopt,
         "raw": dog,
     }
 
 
+# Dogs per pool task in parallel mode: large enough to amortize pickling, small
+# enough that one big source (Wagtopia) still spreads across every worker.
+DEFAULT_BATCH_SIZE = 200
+
+# Bump when a normalizer's output changes for the same input, so the next run
+# ignores the previous manifest and rebuilds every dog.
+NORMALIZER_VERSION = 1
+
+Normalizer = Callable[..., Dict[str, Any]]
+Batch = Tuple[Normalizer, List[Dict[str, Any]], Tuple[Any, ...]]
+# normalizer, raw records, the extra arguments passed after each record, and the
+# output fields those arguments are copied into verbatim.
+Source = Tuple[Normalizer, Iterable[Dict[str, Any]], Tuple[Any, ...], Tuple[str, ...]]
+# A loaded scrape, or one whose records are read from disk as they are normalized.
+Document = Union[Dict[str, Any], StreamedDocument]
+
+
+def _is_dog(pet: Dict[str, Any]) -> bool:
+    return (pet.get("species") or "").lower() == "dog" or (pet.get("type") or "").lower() == "dog"
+
+
+def _normalize_batch(batch: Batch) -> List[Dict[str, Any]]:
+    normalizer, records, extra = batch
+    return [normalizer(record, *extra) for record in records]
+
+
+def _records(document: Document, key: str) -> Iterable[Dict[str, Any]]:
+    if isinstance(document, StreamedDocument):
+        return document.items()
+    return document.get(key) or []
+
+
+def _batched(records: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    iterator = iter(records)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _sources(
+    animal_haven: Document,
+    muddy: Document,
+    nycacc: Document,
+    wagtopia: Document,
+) -> List[Source]:
+    """Every source's records, in the order their dogs appear in the feed."""
+    return [
+        (normalize_animal_haven, _records(animal_haven, "dogs"), (animal_haven.get("scraped_at"),), ("scraped_at",)),
+        (normalize_muddy_paws, _records(muddy, "dogs"), (muddy.get("scraped_at"),), ("scraped_at",)),
+        (
+            normalize_nycacc,
+            (pet for pet in _records(nycacc, "pets") if _is_dog(pet)),
+            (nycacc.get("fetched_at"), nycacc.get("feed_updated")),
+            ("scraped_at", "last_updated_at"),
+        ),
+        (normalize_wagtopia, _records(wagtopia, "dogs"), (wagtopia.get("scraped_at"),), ("scraped_at",)),
+    ]
+
+
+def record_hash(normalizer: Normalizer, record: Dict[str, Any]) -> str:
+    payload = json.dumps(record, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(f"{normalizer.__name__}:{payload}".encode("utf-8")).hexdigest()
+
+
+def iter_normalized(
+    animal_haven: Document,
+    muddy: Document,
+    nycacc: Document,
+    wagtopia: Document,
+    workers: int = 1,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    previous: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Iterator[Tuple[Dict[str, Any], str]]:
+    """Yield ``(dog, hash of its raw record)`` for every source, in feed order.
+
+    ``previous`` maps record hashes to dogs normalized by an earlier run; those
+    records are not normalized again, only their scrape timestamps are refreshed.
+    With ``workers > 1`` batches are normalized in a process pool, at most two
+    per worker ahead of the consumer. Either way the output is identical to a
+    full serial run, and only a bounded number of batches is held at once.
+    """
+    previous = previous or {}
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    window: Deque[Tuple[List[Tuple[Optional[Dict[str, Any]], str]], Optional["Future[List[Dict[str, Any]]]"]]] = deque()
+
+    def drain(entries: List[Tuple[Optional[Dict[str, Any]], str]], normalized: List[Dict[str, Any]]) -> Iterator[Tuple[Dict[str, Any], str]]:
+        fresh = iter(normalized)
+        for dog, digest in entries:
+            yield (dog if dog is not None else next(fresh)), digest
+
+    try:
+        for normalizer, records, extra, context_fields in _sources(animal_haven, muddy, nycacc, wagtopia):
+            for batch in _batched(records, batch_size):
+                entries: List[Tuple[Optional[Dict[str, Any]], str]] = []
+                misses: List[Dict[str, Any]] = []
+                for record in batch:
+                    digest = record_hash(normalizer, record)
+                    dog: Optional[Dict[str, Any]] = None
+                    cached = previous.get(digest)
+                    if cached is None:
+                        misses.append(record)
+                    else:
+                        dog = dict(cached)
+                        dog.update(zip(context_fields, extra))
+                        dog["raw"] = record
+                    entries.append((dog, digest))
+                if pool is None:
+                    yield from drain(entries, _normalize_batch((normalizer, misses, extra)))
+                    continue
+                window.append((entries, pool.submit(_normalize_batch, (normalizer, misses, extra)) if misses else None))
+                if len(window) >= 2 * workers:
+                    entries, future = window.popleft()
+                    yield from drain(entries, future.result() if future is not None else [])
+        while window:
+            entries, future = window.popleft()
+            yield from drain(entries, future.result() if future is not None else [])
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+def normalize_records(
+    animal_haven: Document,
+    muddy: Document,
+    nycacc: Document,
+    wagtopia: Document,
+    workers: int = 1,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    previous: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """``iter_normalized`` collected into the dogs and their record hashes."""
+    dogs: List[Dict[str, Any]] = []
+    hashes: List[str] = []
+    for dog, digest in iter_normalized(animal_haven, muddy, nycacc, wagtopia, workers, batch_size, previous):
+        dogs.append(dog)
+        hashes.append(digest)
+    return dogs, hashes
+
+
 def normalize_all(
-    animal_haven: Dict[str, Any],
-    muddy: Dict[str, Any],
-    nycacc: Dict[str, Any],
-    wagtopia: Dict[str, Any],
+    animal_haven: Document,
+    muddy: Document,
+    nycacc: Document,
+    wagtopia: Document,
+    workers: int = 1,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    dedup: bool = True,
 ) -> List[Dict[str, Any]]:
-    dogs: List[Dict[str, Any]] = []
-    for dog in animal_haven.get("dogs") or []:
-        dogs.append(normalize_animal_haven(dog, animal_haven.get("scraped_at")))
-    for dog in muddy.get("dogs") or []:
-        dogs.append(normalize_muddy_paws(dog, muddy.get("scraped_at")))
-    feed_updated = nycacc.get("feed_updated")
-    scraped_at = nycacc.get("fetched_at")
-    for pet in nycacc.get("pets") or []:
-        if (pet.get("species") or "").lower() != "dog" and (pet.get("type") or "").lower() != "dog":
-            continue
-        dogs.append(normalize_nycacc(pet, scraped_at, feed_updated))
-    for dog in wagtopia.get("dogs") or []:
-        dogs.append(normalize_wagtopia(dog, wagtopia.get("scraped_at")))
-    return dogs
+    """Normalize every source into one list: Animal Haven, Muddy Paws, NYCACC, then Wagtopia.
+
+    Cross-source duplicates are merged as in the CLI unless ``dedup`` is false.
+    """
+    dogs, _ = normalize_records(animal_haven, muddy, nycacc, wagtopia, workers=workers, batch_size=batch_size)
+    return deduplicate(dogs) if dedup else dogs
+
+
+def load_previous(feed_path: Path, manifest: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Dogs from the last written feed keyed by record hash, or nothing if they can't be trusted.
+
+    The manifest lists every record, including duplicates that were dropped from
+    the feed; those have no dog to reuse and are normalized again.
+    """
+    if manifest.get("version") != NORMALIZER_VERSION or not feed_path.exists():
+        return {}
+    by_id: Dict[str, Deque[Dict[str, Any]]] = {}
+    for dog in iter_feed_dogs(feed_path):
+        dog.pop(ALSO_LISTED_AT, None)  # links are recomputed on every run
+        by_id.setdefault(dog.get("id"), deque()).append(dog)
+    previous: Dict[str, Dict[str, Any]] = {}
+    for dog_id, digest in manifest.get("records") or []:
+        dogs = by_id.get(dog_id)
+        if dogs:
+            previous[digest] = dogs.popleft()
+    return previous
+
+
+def feed_delta(previous_records: List[List[str]], records: List[List[str]]) -> Dict[str, List[str]]:
+    """Ids added, removed, or whose raw record changed between two manifests' ``[id, hash]`` records."""
+    before: Dict[str, List[str]] = {}
+    for dog_id, digest in previous_records:
+        before.setdefault(dog_id, []).append(digest)
+    after: Dict[str, List[str]] = {}
+    for dog_id, digest in records:
+        after.setdefault(dog_id, []).append(digest)
+    return {
+        "added": [dog_id for dog_id in after if dog_id not in before],
+        "updated": [dog_id for dog_id, digests in after.items() if dog_id in before and before[dog_id] != digests],
+        "removed": [dog_id for dog_id in before if dog_id not in after],
+    }
 
 
 def read_optional_json(path: Path) -> Dict[str, Any]:
@@ -668,8 +895,11 @@ def read_optional_json(path: Path) -> Dict[str, Any]:
 
 def write_output(data: Dict[str, Any], output: Path) -> None:
     output.parent.mkdir(parents=True, exist_ok=True)
-    with output.open("w", encoding="utf-8") as f:
+    # Write then rename so a running API that watches the feed never reads a torn file.
+    temp_path = output.with_suffix(output.suffix + ".tmp")
+    with temp_path.open("w", encoding="utf-8") as f:
         json.dump(data, f, indent=2)
+    temp_path.replace(output)
 
 
 def parse_args(argv: Optional[Iterable[str]]) -> argparse.Namespace:
@@ -679,29 +909,147 @@ def parse_args(argv: Optional[Iterable[str]]) -> argparse.Namespace:
     parser.add_argument("--nycacc", type=Path, default=DEFAULT_NYCACC, help="Path to NYCACC feed JSON")
     parser.add_argument("--wagtopia", type=Path, default=DEFAULT_WAGTOPIA, help="Path to Wagtopia feed JSON")
     parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="Output path for normalized JSON")
-    return parser.parse_args(list(argv) if argv is not None else None)
+    parser.add_argument(
+        "--format",
+        choices=FEED_FORMATS,
+        default="json",
+        help=(
+            "json: indented document (default); compact: the same document streamed one dog per line with "
+            "the header last; ndjson: one dog per line (--output must end in .ndjson/.jsonl), header in .meta.json"
+        ),
+    )
+    parser.add_argument(
+        "--binary-output",
+        type=Path,
+        default=None,
+        help="Output path for the memory-mapped binary feed (default: --output with a .bin suffix)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Normalize in this many processes (default: 1, serial); output order is unchanged",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Re-normalize every record instead of reusing unchanged ones from the previous run",
+    )
+    parser.add_argument(
+        "--no-dedup",
+        action="store_true",
+        help="Keep every listing instead of merging the same dog listed by several sources",
+    )
+    parser.add_argument("--no-binary", action="store_true", help="Skip writing the binary feed")
+    parser.add_argument(
+        "--raw-output",
+        type=Path,
+        default=None,
+        help="Output path for the raw source payload store (default: --output with a .raw.bin suffix)",
+    )
+    args = parser.parse_args(list(argv) if argv is not None else None)
+    if (args.format == "ndjson") != is_ndjson(args.output):
+        parser.error("--format ndjson needs an --output ending in .ndjson or .jsonl (and only it may use one)")
+    return args
 
 
 def main(argv: Optional[Iterable[str]] = None) -> int:
     args = parse_args(argv)
-    animal_haven = read_optional_json(args.animal_haven)
-    muddy = read_optional_json(args.muddy_paws)
-    nycacc = read_optional_json(args.nycacc)
-    wagtopia = read_optional_json(args.wagtopia)
-    dogs = normalize_all(animal_haven, muddy, nycacc, wagtopia)
-    result = {
+    # Scrapes are read one record at a time as they are normalized, not parsed up front;
+    # a source that was not scraped is simply empty.
+    documents = {
+        "animal_haven": StreamedDocument(args.animal_haven, ("dogs",), missing_ok=True),
+        "muddy_paws": StreamedDocument(args.muddy_paws, ("dogs",), missing_ok=True),
+        "nycacc": StreamedDocument(args.nycacc, ("pets",), missing_ok=True),
+        "wagtopia": StreamedDocument(args.wagtopia, ("dogs",), missing_ok=True),
+    }
+    # The manifest records each dog's raw-record hash, so unchanged records can be
+    # reused next run and the delta lists only what actually changed.
+    manifest_path = args.output.with_suffix(".manifest.json")
+    delta_path = args.output.with_suffix(".delta.json")
+    manifest = read_optional_json(manifest_path)
+    previous = {} if args.full else load_previous(args.output, manifest)
+    result: Dict[str, Any] = {
         "fetched_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
-        "count": len(dogs),
-        "sources": {
-            "animal_haven": {"path": str(args.animal_haven), "count": len(animal_haven.get("dogs") or [])},
-            "muddy_paws": {"path": str(args.muddy_paws), "count": len(muddy.get("dogs") or [])},
-            "nycacc": {"path": str(args.nycacc), "count": len(nycacc.get("pets") or [])},
-            "wagtopia": {"path": str(args.wagtopia), "count": len(wagtopia.get("dogs") or [])},
-        },
-        "dogs": dogs,
+        "count": 0,
+        "sources": {},
     }
-    write_output(result, args.output)
-    print(f"Wrote {len(dogs)} dogs to {args.output}")
+
+    # Upstream payloads go to a sidecar so the feed only carries normalized fields.
+    raw_output = args.raw_output or args.output.with_suffix(".raw.bin")
+    raw_store = RawStoreWriter(raw_output)
+    # Streamed formats write each dog to disk instead of keeping the feed in memory;
+    # "json" keeps the indented document, which needs every dog in memory anyway.
+    writer = FeedWriter(args.output, args.format) if args.format != "json" else None
+    # Duplicates are only known once every dog has been indexed, so streamed dogs
+    # wait in a spool file until they are written out.
+    index = DedupIndex() if not args.no_dedup else None
+    spool = tempfile.TemporaryFile("w+", encoding="utf-8", dir=args.output.parent) if writer is not None else None
+    dogs: List[Dict[str, Any]] = []
+    records: List[List[str]] = []
+    duplicates = Duplicates()
+    try:
+        for dog, digest in iter_normalized(*documents.values(), workers=args.workers, previous=previous):
+            if "raw" in dog:
+                raw_store.add(dog["id"], dog.pop("raw"))
+            records.append([dog["id"], digest])
+            if index is not None:
+                index.add(dog)
+            if spool is None:
+                dogs.append(dog)
+            else:
+                spool.write(json.dumps(dog, separators=(",", ":")) + "\n")
+        if index is not None:
+            duplicates = index.resolve()
+        # The raw store goes first: the API expects it to be current once the feed changes.
+        raw_store.close()
+        result["count"] = len(records) - len(duplicates.dropped)
+        # Record counts are only known once each scrape has been read through.
+        result["sources"] = {name: {"path": str(doc.path), "count": doc.count} for name, doc in documents.items()}
+        if writer is None:
+            result["dogs"] = list(duplicates.apply(dogs))
+            write_output(result, args.output)
+        else:
+            assert spool is not None
+            spool.seek(0)
+            for dog in duplicates.apply(json.loads(line) for line in spool):
+                writer.write(dog)
+            writer.close(result)
+    except BaseException:
+        if writer is not None:
+            writer.abort()
+        raise
+    finally:
+        if spool is not None:
+            spool.close()
+        for document in documents.values():
+            document.close()
+
+    write_output({"version": NORMALIZER_VERSION, "fetched_at": result["fetched_at"], "records": records}, manifest_path)
+    delta = feed_delta(manifest.get("records") or [], records)
+    write_output({"fetched_at": result["fetched_at"], "previous_fetched_at": manifest.get("fetched_at"), **delta}, delta_path)
+    print(f"Wrote {result['count']} dogs to {args.output} (raw payloads in {raw_output})")
+    if index is not None:
+        print(
+            f"Merged {len(duplicates.dropped)} cross-source duplicates into {len(duplicates.links)} dogs "
+            f"({index.comparisons} candidate pairs compared)"
+        )
+    print(
+        f"Reused {sum(digest in previous for _, digest in records)} unchanged records; "
+        f"{len(delta['added'])} added, {len(delta['updated'])} updated, {len(delta['removed'])} removed ({delta_path})"
+    )
+    binary_output = args.binary_output or args.output.with_suffix(".bin")
+    if not args.no_binary and writer is None:
+        write_binary_feed(result, binary_output)
+        print(f"Wrote binary feed to {binary_output}")
+    elif binary_output.exists():
+        # Streaming avoids holding the whole feed, which dogs.bin needs, and --no-binary
+        # skips it; either way drop the stale copy so nothing serves the old feed from it.
+        binary_output.unlink()
+        print(
+            f"Removed stale binary feed {binary_output}; rebuild it with "
+            f"python -m zestie_matcher.matcher.binary_feed --feed {args.output}"
+        )
     return 0
 
 
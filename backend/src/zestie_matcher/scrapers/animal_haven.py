@@ -11,16 +11,22 @@ import argparse
 import dataclasses
 import json
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Callable, Iterable, List, Optional
-from urllib.parse import urljoin
+from typing import Callable, Dict, Iterable, List, Optional
+from urllib.parse import urljoin, urlparse
 
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 
 DEFAULT_LISTING_URL = "https://animalhaven.org/adopt/dogs"
 DEFAULT_TIMEOUT = 15
+DEFAULT_WORKERS = 8
+DEFAULT_RATE = 8.0  # requests per second per host
 DEFAULT_OUTPUT_PATH = Path("data/raw/animal_haven/animalhaven.json")
 USER_AGENT = "ShelterDogMatcherBot/0.1 (+https://github.com/Yulufu/zestie_matcher)"
 
@@ -86,12 +92,52 @@ def normalize_text(value: str) -> str:
     return _get_whitespace_re().sub(" ", value).strip()
 
 
-def fetch_html(url: str, timeout: int) -> str:
-    resp = requests.get(url, timeout=timeout, headers={"User-Agent": USER_AGENT})
+def fetch_html(url: str, timeout: int, session: Optional[requests.Session] = None) -> str:
+    resp = (session or requests).get(url, timeout=timeout, headers={"User-Agent": USER_AGENT})
     resp.raise_for_status()
     return resp.text
 
 
+class HostRateLimiter:
+    """Space out request starts to at most ``rate`` per second for each host (thread-safe)."""
+
+    def __init__(self, rate: float) -> None:
+        self._interval = 1.0 / rate if rate > 0 else 0.0
+        self._next: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url: str) -> None:
+        if not self._interval:
+            return
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next.get(host, now))
+            self._next[host] = start + self._interval
+        if start > now:
+            time.sleep(start - now)
+
+
+def build_fetcher(
+    timeout: int = DEFAULT_TIMEOUT,
+    workers: int = DEFAULT_WORKERS,
+    rate: float = DEFAULT_RATE,
+) -> Callable[[str], str]:
+    """A fetcher that shares one keep-alive session (one pooled connection per worker)
+    across threads, rate limited per host."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(workers, 1))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    limiter = HostRateLimiter(rate)
+
+    def fetch(url: str) -> str:
+        limiter.wait(url)
+        return fetch_html(url, timeout, session=session)
+
+    return fetch
+
+
 def parse_listing_cards(html: str, base_url: str) -> List[DogPreview]:
     soup = BeautifulSoup(html, "html.parser")
     cards: List[DogPreview] = []
@@ -252,13 +298,21 @@ def scrape_animal_haven(
     *,
     fetcher: Callable[[str], str],
     max_dogs: Optional[int] = None,
+    workers: int = 1,
 ) -> dict:
+    """Scrape the listing page, then every dog's detail page.
+
+    With ``workers > 1`` detail pages are fetched concurrently (``fetcher`` must
+    be thread-safe); dogs keep the listing's order either way.
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
     listing_html = fetcher(listing_url)
     previews = parse_listing_cards(listing_html, listing_url)
     if max_dogs is not None:
         previews = previews[:max_dogs]
-    dogs: List[DogRecord] = []
-    for preview in previews:
+
+    def fetch_record(preview: DogPreview) -> DogRecord:
         detail_data: Optional[DogDetail]
         try:
             detail_html = fetcher(preview.detail_url)
@@ -266,7 +320,13 @@ def scrape_animal_haven(
         except Exception as exc:  # noqa: BLE001
             print(f"Warning: failed to fetch detail page for {preview.name}: {exc}", file=sys.stderr)
             detail_data = None
-        dogs.append(combine_preview_and_detail(preview, detail_data))
+        return combine_preview_and_detail(preview, detail_data)
+
+    if workers == 1 or len(previews) < 2:
+        dogs = [fetch_record(preview) for preview in previews]
+    else:
+        with ThreadPoolExecutor(max_workers=min(workers, len(previews))) as executor:
+            dogs = list(executor.map(fetch_record, previews))
     scraped_at = datetime.now(timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
     return {
         "source_url": listing_url,
@@ -314,14 +374,20 @@ def main(argv: Optional[Iterable[str]] = None) -> int:
     parser.add_argument("--url", default=DEFAULT_LISTING_URL, help="Listing page to scrape")
     parser.add_argument("--timeout", type=int, default=DEFAULT_TIMEOUT, help="HTTP timeout in seconds")
     parser.add_argument("--limit", type=int, default=None, help="Limit number of dogs (useful for tests)")
+    parser.add_argument(
+        "--workers", type=int, default=DEFAULT_WORKERS, help="Detail pages fetched concurrently (1 fetches them one at a time)"
+    )
+    parser.add_argument(
+        "--rate", type=float, default=DEFAULT_RATE, help="Maximum requests per second to each host (0 for no limit)"
+    )
     parser.add_argument("--format", choices=["json", "markdown"], default="json", help="Output format")
     parser.add_argument("--output", type=Path, help="Write output to this path (defaults to stdout)")
     args = parser.parse_args(list(argv) if argv is not None else None)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
 
-    def network_fetcher(url: str) -> str:
-        return fetch_html(url, args.timeout)
-
-    result = scrape_animal_haven(args.url, fetcher=network_fetcher, max_dogs=args.limit)
+    network_fetcher = build_fetcher(args.timeout, args.workers, args.rate)
+    result = scrape_animal_haven(args.url, fetcher=network_fetcher, max_dogs=args.limit, workers=args.workers)
 
     if args.format == "json":
         output_text = json.dumps(result, indent=2) + "\n"
@@ -0,0 +1,8 @@
+import sys
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parents[1]
+# ``zestie_matcher`` lives under src/, the API package (``app``) at the backend root.
+for path in (BACKEND / "src", BACKEND):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
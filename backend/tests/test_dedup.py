@@ -0,0 +1,46 @@
+from zestie_matcher.normalization.dedup import ALSO_LISTED_AT, deduplicate
+
+LOGO = "https://photos.example/shelter-logo.png"
+
+
+def _dog(dog_id, name, sex, weight, state="NY", photo=None):
+    return {
+        "id": dog_id,
+        "source_id": dog_id.split(":")[0],
+        "name": name,
+        "sex": sex,
+        "weight_lbs": weight,
+        "location_state": state,
+        "photo_urls": [photo or f"https://photos.example/{dog_id}.jpg"],
+    }
+
+
+def test_shared_photo_merges_a_relisted_dog():
+    photo = "https://photos.example/rex-1.jpg"
+    dogs = deduplicate([_dog("nycacc:1", "Rex", "Male", 70, photo=photo), _dog("wagtopia:1", "Rex", "Male", 68, photo=photo)])
+    assert [dog["id"] for dog in dogs] == ["nycacc:1"]
+    assert dogs[0][ALSO_LISTED_AT][0]["id"] == "wagtopia:1"
+
+
+def test_shared_photo_with_different_name_and_weight_does_not_merge():
+    dogs = deduplicate(
+        [_dog("nycacc:1", "Rex", "Male", 70, photo=LOGO), _dog("wagtopia:9", "Bella", "Male", 8, state="CA", photo=LOGO)]
+    )
+    assert [dog["id"] for dog in dogs] == ["nycacc:1", "wagtopia:9"]
+    assert not any(ALSO_LISTED_AT in dog for dog in dogs)
+
+
+def test_shared_photo_with_same_name_but_contradicting_weight_does_not_merge():
+    dogs = deduplicate([_dog("nycacc:1", "Max", "Male", 70, photo=LOGO), _dog("wagtopia:1", "Max", "Male", 8, photo=LOGO)])
+    assert len(dogs) == 2
+
+
+def test_photo_shared_by_several_names_is_ignored():
+    dogs = deduplicate(
+        [
+            _dog("nycacc:1", "Max", "Male", 40, photo=LOGO),
+            _dog("muddy_paws:1", "Luna", "Female", 30, photo=LOGO),
+            _dog("wagtopia:1", "Max", "Male", 41, photo=LOGO),
+        ]
+    )
+    assert len(dogs) == 3
@@ -0,0 +1,67 @@
+"""Golden outputs of the description parsers.
+
+``data/description_golden.json`` was generated with the per-field parsers that
+``analyze_description`` replaced, on real feed descriptions plus hand-written
+negations; the single-pass analysis and its ``parse_*`` wrappers must match them.
+"""
+
+import json
+from dataclasses import asdict
+from pathlib import Path
+
+import pytest
+
+from zestie_matcher.normalization.normalize_dogs import (
+    analyze_description,
+    parse_crate_trained,
+    parse_energy_level,
+    parse_foster_to_adopt,
+    parse_house_trained,
+    parse_spayed_neutered,
+    parse_vaccinations_up_to_date,
+)
+
+GOLDEN = json.loads((Path(__file__).parent / "data" / "description_golden.json").read_text(encoding="utf-8"))
+CASES = GOLDEN["cases"]
+
+PARSERS = {
+    "house_trained": parse_house_trained,
+    "crate_trained": parse_crate_trained,
+    "spayed_neutered": parse_spayed_neutered,
+    "vaccinations_up_to_date": parse_vaccinations_up_to_date,
+    "foster_to_adopt": parse_foster_to_adopt,
+    "energy_level": parse_energy_level,
+}
+
+
+def _case_id(case):
+    text = case["text"]
+    return "none" if text is None else repr(text[:40])
+
+
+@pytest.mark.parametrize("case", CASES, ids=_case_id)
+def test_analyze_description_matches_golden(case):
+    assert asdict(analyze_description(case["text"])) == case["expected"]
+
+
+@pytest.mark.parametrize("case", CASES, ids=_case_id)
+def test_parsers_match_golden(case):
+    for field, parse in PARSERS.items():
+        assert parse(case["text"]) == case["expected"][field], field
+
+
+@pytest.mark.parametrize(
+    "text, field, expected",
+    [
+        ("She is not package trained but learning fast.", "house_trained", None),
+        ("Buddy is NOT house trained yet.", "house_trained", False),
+        ("Not good with cats, great with kids. House-trained.", "house_trained", True),
+        ("Housebroken, not yet neutered.", "spayed_neutered", False),
+    ],
+)
+def test_negations(text, field, expected):
+    assert getattr(analyze_description(text), field) == expected
+
+
+def test_golden_covers_every_field():
+    assert set(GOLDEN["fields"]) == set(PARSERS)
@@ -0,0 +1,15 @@
+import pytest
+
+from zestie_matcher.matcher.feed_stream import StreamedDocument
+from zestie_matcher.matcher.match import load_normalized_feed
+
+
+def test_missing_feed_raises(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_normalized_feed(tmp_path / "dogs.json")
+
+
+def test_missing_optional_document_is_empty(tmp_path):
+    with StreamedDocument(tmp_path / "wagtopia.json", ("dogs",), missing_ok=True) as document:
+        assert list(document.items()) == []
+        assert document.header == {}
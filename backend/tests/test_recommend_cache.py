@@ -0,0 +1,25 @@
+from app.services.recommend_cache import RecommendCache
+from zestie_matcher.matcher.match import ScoredFeed
+
+
+def _scored(dogs):
+    scores = [0.5] * dogs
+    return ScoredFeed(keep=[True] * dogs, base=scores, pref=scores, core=scores, bonus=scores, final=scores)
+
+
+def test_byte_budget_evicts_least_recently_used():
+    one_entry = _scored(1000).compact().nbytes
+    cache = RecommendCache(max_entries=100, max_bytes=2 * one_entry)
+    for key in ("a", "b", "c"):
+        cache.put(key, _scored(1000), generation=1, views_version=0)
+    assert cache.get("a", 1, 0) is None
+    assert cache.get("c", 1, 0) is not None
+    stats = cache.stats()
+    assert stats["bytes"] == 2 * one_entry
+    assert stats["evictions"] == 1
+
+
+def test_entry_over_budget_is_not_cached():
+    cache = RecommendCache(max_bytes=100)
+    cache.put("a", _scored(1000), generation=1, views_version=0)
+    assert cache.stats()["entries"] == 0
@@ -15,6 +15,8 @@ export interface RecommendRequest {
   hard_filters: Record<string, unknown>;
   preferences: PreferencePayload[];
   seen_dog_ids: string[];
+  cursor?: string | null;
+  fields?: string[];
 }
 
 export interface RecommendResult {
@@ -32,6 +34,7 @@ export interface RecommendResponse {
   meta: {
     total_found: number;
     prompt_trigger?: string | null;
+    next_cursor?: string | null;
   };
 }
 